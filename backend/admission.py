@@ -0,0 +1,189 @@
+"""
+Admission control for prediction endpoints
+Per-model concurrency limits with a bounded, deadline-aware wait queue and early load shedding
+"""
+import asyncio
+import math
+import time
+from collections import deque
+
+from starlette.responses import JSONResponse
+
+
+class RequestShed(Exception):
+    """Raised when a request is rejected instead of queued"""
+
+    def __init__(self, status_code, reason, retry_after):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Admits at most `max_concurrency` requests at a time. Further requests wait
+    in a FIFO queue of at most `max_queue` entries for up to `queue_timeout`
+    seconds. Requests are shed up front when the queue is full (429) or when
+    the expected wait, estimated from recent service times, exceeds the
+    deadline (503); requests that time out in the queue also get 503.
+    """
+
+    def __init__(self, max_concurrency, max_queue, queue_timeout, recent_waits=1024):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._active = 0
+        self._waiters = deque()
+        self._service_time = 0.0  # EWMA of seconds a request holds a slot
+        self._recent_waits = deque(maxlen=recent_waits)
+
+        self.counters = {
+            'admitted': 0, 'completed': 0, 'max_queue_depth': 0,
+            'shed_queue_full': 0, 'shed_deadline': 0, 'shed_timeout': 0
+        }
+
+    def expected_wait(self, position):
+        """Estimated seconds until a request at queue `position` (1-based) gets a slot"""
+        return math.ceil(position / self.max_concurrency) * self._service_time
+
+    def _retry_after(self):
+        return max(1, math.ceil(self.expected_wait(len(self._waiters) + 1)))
+
+    async def acquire(self):
+        """Wait for a slot; returns seconds spent queued or raises RequestShed"""
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._admit(0.0)
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            self.counters['shed_queue_full'] += 1
+            raise RequestShed(429, "Too many queued requests", self._retry_after())
+        if self.expected_wait(len(self._waiters) + 1) > self.queue_timeout:
+            self.counters['shed_deadline'] += 1
+            raise RequestShed(503, "Queue wait would exceed deadline", self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counters['max_queue_depth'] = max(self.counters['max_queue_depth'], len(self._waiters))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not (waiter.done() and not waiter.cancelled()):
+                self._abandon(waiter)
+                self.counters['shed_timeout'] += 1
+                raise RequestShed(503, "Timed out waiting for capacity", self._retry_after())
+        except asyncio.CancelledError:
+            # Client went away: give back a slot that was already handed over
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0)
+            else:
+                self._abandon(waiter)
+            raise
+
+        waited = time.perf_counter() - start
+        self._admit(waited)
+        return waited
+
+    def _abandon(self, waiter):
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _admit(self, waited):
+        self.counters['admitted'] += 1
+        self._recent_waits.append(waited)
+
+    def release(self, service_time):
+        """Free a slot, handing it directly to the next live waiter"""
+        if service_time:
+            self.counters['completed'] += 1
+            self._service_time = service_time if not self._service_time else (
+                0.9 * self._service_time + 0.1 * service_time
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def stats(self):
+        waits = sorted(self._recent_waits)
+
+        def percentile(q):
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 3) if waits else 0.0
+
+        return {
+            **self.counters,
+            'shed_total': sum(v for k, v in self.counters.items() if k.startswith('shed_')),
+            'active': self._active,
+            'queue_depth': len(self._waiters),
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'queue_timeout_s': self.queue_timeout,
+            'service_time_ms': round(self._service_time * 1000, 3),
+            'wait_ms_p50': percentile(0.5),
+            'wait_ms_p99': percentile(0.99)
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware gating `/predict/<model>` paths through the matching
+    AdmissionController. `shared` maps endpoints that score several models
+    (e.g. screening) to those models' keys; such a request takes a slot from
+    each of their controllers, so it counts against every per-model limit.
+    All other paths (health check, model info, metrics) bypass the queue
+    entirely so they stay responsive under load.
+    """
+
+    def __init__(self, app, controllers, shared=None, prefix="/predict/"):
+        self.app = app
+        self.controllers = controllers
+        self.shared = shared or {}
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        controllers = []
+        if scope['type'] == 'http' and scope['path'].startswith(self.prefix):
+            key = scope['path'][len(self.prefix):].split('/')[0].replace('-', '_')
+            # Fixed order, so requests needing several slots always take them in the same sequence
+            keys = sorted(self.shared.get(key, (key,)))
+            controllers = [self.controllers[k] for k in keys if k in self.controllers]
+        if not controllers:
+            await self.app(scope, receive, send)
+            return
+
+        acquired = []
+        try:
+            for controller in controllers:
+                await controller.acquire()
+                acquired.append(controller)
+        except RequestShed as shed:
+            for controller in acquired:
+                controller.release(0.0)
+            response = JSONResponse(
+                {'detail': shed.reason},
+                status_code=shed.status_code,
+                headers={'Retry-After': str(shed.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+        except BaseException:
+            for controller in acquired:
+                controller.release(0.0)
+            raise
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.perf_counter() - start
+            for controller in acquired:
+                controller.release(elapsed)
@@ -0,0 +1,221 @@
+"""
+Prediction audit log
+Records are queued in an in-memory ring buffer and flushed in batches by a background
+thread to rotated, append-only JSONL files
+"""
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "sync_flush")
+FILE_PREFIX = "audit-"
+
+
+class AuditLog:
+    """
+    Non-blocking audit sink. `record()` only appends to a bounded buffer; a
+    writer thread flushes every `flush_interval` seconds or once `batch_size`
+    records are waiting. Files rotate by size and age.
+
+    `file_tag` is added to file names so several processes can share one
+    directory (e.g. "w0", "w1" for forked workers).
+
+    Overflow policies when the buffer is full:
+      drop_oldest - evict the oldest buffered record
+      drop_newest - discard the incoming record
+      sync_flush  - write the buffer in the caller (no loss, adds disk latency)
+    """
+
+    def __init__(self, directory="logs/audit", capacity=10000, batch_size=500,
+                 flush_interval=1.0, max_file_bytes=64 * 1024 * 1024,
+                 rotate_seconds=3600, overflow="drop_oldest", file_tag=""):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        self.directory = Path(directory)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.rotate_seconds = rotate_seconds
+        self.overflow = overflow
+        self.file_tag = file_tag
+
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._file = None
+        self._file_opened_at = 0.0
+        self._file_seq = 0
+
+        self.counters = {'recorded': 0, 'written': 0, 'dropped': 0, 'write_errors': 0, 'files_rotated': 0}
+
+    def record(self, model_type, model_name, inputs, prediction, probability):
+        """Queue one prediction record; never touches disk unless policy is sync_flush"""
+        entry = {
+            'ts': time.time(),
+            'model_type': model_type,
+            'model': model_name,
+            'inputs': inputs,
+            'prediction': prediction,
+            'probability': probability
+        }
+        with self._lock:
+            self.counters['recorded'] += 1
+            if len(self._buffer) >= self.capacity:
+                if self.overflow == "drop_newest":
+                    self.counters['dropped'] += 1
+                    return False
+                if self.overflow == "drop_oldest":
+                    self._buffer.popleft()
+                    self.counters['dropped'] += 1
+            self._buffer.append(entry)
+            pending = len(self._buffer)
+
+        if pending >= self.capacity and self.overflow == "sync_flush":
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the writer thread after a final flush"""
+        if self._thread is not None:
+            self._stop.set()
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Write all buffered records to the current log file"""
+        with self._write_lock:
+            with self._lock:
+                if not self._buffer:
+                    return 0
+                batch, self._buffer = self._buffer, deque()
+
+            lines = []
+            for entry in batch:
+                entry = dict(entry)
+                entry['timestamp'] = datetime.fromtimestamp(entry.pop('ts'), timezone.utc).isoformat()
+                lines.append(json.dumps(entry, separators=(',', ':')))
+            payload = "\n".join(lines) + "\n"
+
+            try:
+                f = self._current_file()
+                f.write(payload)
+                f.flush()
+            except OSError as e:
+                self.counters['write_errors'] += 1
+                self.counters['dropped'] += len(batch)
+                print(f"⚠️ Audit log write failed, {len(batch)} records lost: {e}")
+                return 0
+
+            self.counters['written'] += len(batch)
+            return len(batch)
+
+    def _current_file(self):
+        """Return the open log file, rotating it by size or age first"""
+        now = time.time()
+        if self._file is not None and (
+            self._file.tell() >= self.max_file_bytes
+            or now - self._file_opened_at >= self.rotate_seconds
+        ):
+            self._file.close()
+            self._file = None
+            self.counters['files_rotated'] += 1
+
+        if self._file is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._file_seq += 1
+            stamp = datetime.fromtimestamp(now, timezone.utc).strftime("%Y%m%dT%H%M%S")
+            tag = f"-{self.file_tag}" if self.file_tag else ""
+            path = self.directory / f"{FILE_PREFIX}{stamp}{tag}-{self._file_seq:04d}.jsonl"
+            self._file = open(path, 'a', encoding='utf-8')
+            self._file_opened_at = now
+        return self._file
+
+    def stats(self):
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            **self.counters,
+            'buffered': buffered,
+            'capacity': self.capacity,
+            'overflow_policy': self.overflow,
+            'directory': str(self.directory)
+        }
+
+
+def iter_audit_records(directory="logs/audit", start=None, end=None, model_type=None, flush_interval=1.0):
+    """
+    Iterate audit records for offline analysis, in time order per writing process.
+    `start`/`end` are timezone-aware datetimes; whole files outside the window are skipped
+    using the start time encoded in each file name. That stamp is when the file was
+    opened, truncated to the second, and the first batch written to it can hold records
+    buffered up to `flush_interval` earlier, so both checks keep that much slack.
+    """
+    slack = timedelta(seconds=flush_interval + 1)
+    paths = sorted(Path(directory).glob(f"{FILE_PREFIX}*.jsonl"))
+
+    def file_start(path):
+        stamp = path.stem[len(FILE_PREFIX):].split('-')[0]
+        return datetime.strptime(stamp, "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+
+    def file_tag(path):
+        return '-'.join(path.stem[len(FILE_PREFIX):].split('-')[1:-1])
+
+    # Next file written by the same process, which bounds this file's records
+    next_files = {}
+    latest_by_tag = {}
+    for path in reversed(paths):
+        next_files[path] = latest_by_tag.get(file_tag(path))
+        latest_by_tag[file_tag(path)] = path
+
+    for path in paths:
+        # Files are sorted by start, so no later file can hold records before `end` either
+        if end is not None and file_start(path) - slack > end:
+            break
+        # Every record in this file was written before the next file was opened
+        next_file = next_files[path]
+        if start is not None and next_file is not None and file_start(next_file) + slack < start:
+            continue
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partially written last line of a file that is still open
+                    continue
+                if model_type is not None and entry['model_type'] != model_type:
+                    continue
+                if start is not None or end is not None:
+                    timestamp = datetime.fromisoformat(entry['timestamp'])
+                    if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+                        continue
+                yield entry
@@ -0,0 +1,303 @@
+"""
+Asynchronous batch-scoring jobs
+CSV datasets are scored in chunks by background workers; job state lives in SQLite so
+jobs survive a restart and resume from the last committed chunk
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    model_type TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    result_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_rows INTEGER,
+    rows_done INTEGER NOT NULL DEFAULT 0,
+    result_bytes INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    run_started_at REAL,
+    run_start_rows INTEGER NOT NULL DEFAULT 0,
+    finished_at REAL,
+    error TEXT,
+    owner TEXT,
+    heartbeat_at REAL
+)
+"""
+# Columns added after the first release, for stores created by older versions
+MIGRATIONS = {'owner': "TEXT", 'heartbeat_at': "REAL"}
+
+
+class JobStore:
+    """SQLite persistence for job state (one short-lived connection per call)"""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def insert(self, job):
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(job)}) VALUES ({', '.join('?' * len(job))})",
+                list(job.values())
+            )
+
+    def update(self, job_id, expected_status=None, expected_owner=None, **fields):
+        """
+        Update a job, only if it is still in `expected_status` and held by `expected_owner`
+        when given; returns whether it was
+        """
+        query = f"UPDATE jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?"
+        params = [*fields.values(), job_id]
+        if expected_status is not None:
+            query += " AND status = ?"
+            params.append(expected_status)
+        if expected_owner is not None:
+            query += " AND owner = ?"
+            params.append(expected_owner)
+        with self._connect() as conn:
+            return conn.execute(query, params).rowcount > 0
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, limit=100):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def next_queued(self):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+        return dict(row) if row else None
+
+    def requeue_expired(self, lease_seconds):
+        """Put running jobs whose owner stopped renewing its lease (a crashed process) back in the queue"""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL "
+                "WHERE status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (time.time() - lease_seconds,)
+            ).rowcount
+
+
+class JobManager:
+    """
+    Runs batch-scoring jobs on `max_concurrent` worker threads, `chunk_size`
+    rows at a time. `score_fn(model_type, X)` returns (predictions, probabilities)
+    and `features_fn(model_type)` the model's feature column order.
+
+    Workers take queued jobs from the store (polled every `poll_interval`
+    seconds). A job is claimed by a conditional status change that records the
+    claiming process as its owner, and the owner renews that lease before
+    writing each chunk. Jobs whose lease is older than `lease_seconds` belong to
+    a crashed process and are queued again, so several processes can share one
+    store without ever running the same job twice. `lease_seconds` must exceed
+    the time it takes to score one chunk.
+
+    Each chunk's results are appended and fsynced before its progress is
+    committed; on resume the result file is truncated back to the committed
+    size, so a crash never duplicates or loses rows.
+    """
+
+    def __init__(self, directory, score_fn, features_fn, max_concurrent=1, chunk_size=10000,
+                 poll_interval=1.0, lease_seconds=60.0):
+        self.directory = Path(directory)
+        self.upload_dir = self.directory / "uploads"
+        self.result_dir = self.directory / "results"
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.result_dir.mkdir(parents=True, exist_ok=True)
+
+        self.store = JobStore(self.directory / "jobs.db")
+        self.score_fn = score_fn
+        self.features_fn = features_fn
+        self.max_concurrent = max_concurrent
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+
+        self._owner = None
+        self._workers = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+
+    def start(self, run_jobs=True):
+        """
+        Start workers, which also pick up jobs of crashed processes once their lease
+        expires. Without `run_jobs` this process only submits, cancels and reports on jobs.
+        """
+        if not run_jobs:
+            return
+        # Set here rather than in __init__ so each forked process gets its own identity
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop.clear()
+        for i in range(self.max_concurrent):
+            worker = threading.Thread(target=self._run, name=f"batch-job-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self):
+        """Stop workers after their current chunk; their jobs are queued again to resume later"""
+        self._stop.set()
+        self._wakeup.set()
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def new_upload_path(self):
+        return self.upload_dir / f"{uuid.uuid4().hex}.csv"
+
+    def submit(self, model_type, source_path):
+        """Validate the dataset header and queue a job; returns the job record"""
+        source_path = Path(source_path)
+        header = pd.read_csv(source_path, nrows=0).columns
+        missing = [name for name in self.features_fn(model_type) if name not in header]
+        if missing:
+            raise ValueError(f"Dataset is missing feature columns: {missing}")
+
+        job_id = uuid.uuid4().hex
+        self.store.insert({
+            'id': job_id,
+            'model_type': model_type,
+            'source_path': str(source_path),
+            'result_path': str(self.result_dir / f"{job_id}.csv"),
+            'status': "queued",
+            'created_at': time.time()
+        })
+        self._wakeup.set()
+        return self.status(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a job; a running job stops and cleans up before its next chunk"""
+        if self.store.update(job_id, expected_status="queued", status="cancelled", finished_at=time.time()):
+            self._remove_files(self.store.get(job_id), results=True)
+        else:
+            self.store.update(job_id, expected_status="running", status="cancelled", finished_at=time.time())
+        return self.status(job_id)
+
+    def _remove_files(self, job, results=False):
+        """Uploaded inputs are only kept for resuming; partial results of failed or cancelled jobs are dropped"""
+        source_path = Path(job['source_path'])
+        if source_path.parent == self.upload_dir:
+            source_path.unlink(missing_ok=True)
+        if results:
+            Path(job['result_path']).unlink(missing_ok=True)
+
+    def status(self, job_id):
+        """Job record with progress, throughput and ETA"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+
+        rows_per_sec = None
+        eta_seconds = None
+        if job['status'] == "running" and job['run_started_at']:
+            elapsed = time.time() - job['run_started_at']
+            rows = job['rows_done'] - job['run_start_rows']
+            if elapsed > 0 and rows > 0:
+                rows_per_sec = rows / elapsed
+                if job['total_rows'] is not None:
+                    eta_seconds = (job['total_rows'] - job['rows_done']) / rows_per_sec
+
+        return {
+            'job_id': job['id'],
+            'model_type': job['model_type'],
+            'status': job['status'],
+            'total_rows': job['total_rows'],
+            'rows_done': job['rows_done'],
+            'progress': round(job['rows_done'] / job['total_rows'], 4) if job['total_rows'] else 0.0,
+            'rows_per_sec': round(rows_per_sec, 1) if rows_per_sec else None,
+            'eta_seconds': round(eta_seconds, 1) if eta_seconds is not None else None,
+            'created_at': job['created_at'],
+            'finished_at': job['finished_at'],
+            'error': job['error']
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            job = self.store.next_queued()
+            if job is None:
+                self.store.requeue_expired(self.lease_seconds)
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            try:
+                self._process(job)
+            except Exception as e:
+                if self.store.update(job['id'], expected_status="running", expected_owner=self._owner,
+                                     status="failed", owner=None, error=str(e), finished_at=time.time()):
+                    self._remove_files(job, results=True)
+                print(f"⚠️ Batch job {job['id']} failed: {e}")
+
+    def _process(self, job):
+        job_id = job['id']
+        rows_done = job['rows_done']
+        # Claim the job; another worker or a cancel may have got there first
+        if not self.store.update(job_id, expected_status="queued", status="running", owner=self._owner,
+                                 heartbeat_at=time.time(), run_started_at=time.time(), run_start_rows=rows_done):
+            return
+        lease = {'expected_status': "running", 'expected_owner': self._owner}
+
+        features = self.features_fn(job['model_type'])
+        if job['total_rows'] is None:
+            with open(job['source_path'], 'rb') as f:
+                self.store.update(job_id, total_rows=max(sum(1 for _ in f) - 1, 0))
+
+        with open(job['result_path'], 'ab') as out:
+            # Drop anything written after the last committed chunk
+            out.truncate(job['result_bytes'])
+            out.seek(job['result_bytes'])
+
+            reader = pd.read_csv(
+                job['source_path'], chunksize=self.chunk_size,
+                skiprows=range(1, rows_done + 1) if rows_done else None
+            )
+            for chunk in reader:
+                if self._stop.is_set():
+                    # Hand the job back right away instead of letting its lease expire
+                    self.store.update(job_id, **lease, status="queued", owner=None)
+                    return
+
+                predictions, probabilities = self.score_fn(
+                    job['model_type'], chunk[features].to_numpy(dtype=float)
+                )
+                # Renew the lease before touching the file; a cancelled job or an
+                # expired lease taken over by another process stops here
+                if not self.store.update(job_id, **lease, heartbeat_at=time.time()):
+                    break
+                chunk['prediction'] = predictions
+                chunk['probability'] = probabilities.round(4)
+                out.write(chunk.to_csv(index=False, header=(out.tell() == 0)).encode('utf-8'))
+                out.flush()
+                os.fsync(out.fileno())
+
+                rows_done += len(chunk)
+                self.store.update(job_id, **lease, rows_done=rows_done, result_bytes=out.tell())
+
+        # A cancel that arrived during the last chunk wins over completion
+        if self.store.update(job_id, **lease, status="completed", owner=None, finished_at=time.time()):
+            self._remove_files(job)
+        elif self.store.get(job_id)['status'] == "cancelled":
+            self._remove_files(job, results=True)
@@ -0,0 +1,186 @@
+"""
+Compact model artifacts for serving
+Flattened float32 tree ensembles and linear models stored as plain .npz arrays
+"""
+import hashlib
+import json
+import numpy as np
+
+
+def _leaf_values(tree, is_classifier):
+    """Per-node positive-class probability (classifier) or mean target (regressor)"""
+    value = tree.value[:, 0, :]
+    if is_classifier:
+        totals = value.sum(axis=1)
+        totals[totals == 0] = 1.0
+        return value[:, 1] / totals if value.shape[1] > 1 else np.zeros(len(value))
+    return value[:, 0]
+
+
+def _flatten_tree(estimator, max_depth=None):
+    """
+    Walk a fitted sklearn decision tree and return its reachable nodes as arrays.
+    Nodes at `max_depth` are turned into leaves holding their training distribution.
+    """
+    tree = estimator.tree_
+    is_classifier = hasattr(estimator, 'classes_')
+    values = _leaf_values(tree, is_classifier)
+
+    feature, threshold, left, right, value = [], [], [], [], []
+    # Preorder walk: (old node id, depth, slot in parent to patch)
+    stack = [(0, 0, None)]
+    while stack:
+        node, depth, parent_slot = stack.pop()
+        new_id = len(feature)
+        if parent_slot is not None:
+            parent_slot[0][parent_slot[1]] = new_id
+
+        is_leaf = tree.children_left[node] == -1 or (max_depth is not None and depth >= max_depth)
+        feature.append(0 if is_leaf else int(tree.feature[node]))
+        threshold.append(np.inf if is_leaf else tree.threshold[node])
+        # Leaves point to themselves so batched traversal can run a fixed number of steps
+        left.append(new_id)
+        right.append(new_id)
+        value.append(values[node])
+
+        if not is_leaf:
+            stack.append((tree.children_right[node], depth + 1, (right, new_id)))
+            stack.append((tree.children_left[node], depth + 1, (left, new_id)))
+
+    # Round thresholds down to float32 so `x <= t` matches sklearn, which compares float32 inputs
+    threshold = np.asarray(threshold)
+    threshold32 = threshold.astype(np.float32)
+    rounded_up = threshold32 > threshold
+    threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+
+    return (np.asarray(feature), threshold32, np.asarray(left),
+            np.asarray(right), np.asarray(value))
+
+
+class CompactForest:
+    """
+    Tree ensemble stored as flat node arrays (float32 thresholds and leaf values).
+    Prediction traverses all trees for all rows at once with numpy indexing.
+    """
+
+    kind = 'forest'
+
+    def __init__(self, feature, threshold, left, right, value, roots, depth, info=None):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.value = np.asarray(value, dtype=np.float32)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.depth = int(depth)
+        self.info = info or {}
+
+    @classmethod
+    def from_estimators(cls, estimators, max_depth=None, info=None):
+        """Build from a list of fitted sklearn decision trees"""
+        parts = [_flatten_tree(est, max_depth) for est in estimators]
+        offsets = np.cumsum([0] + [len(p[0]) for p in parts[:-1]])
+        depth = max(est.tree_.max_depth for est in estimators)
+        if max_depth is not None:
+            depth = min(depth, max_depth)
+        return cls(
+            feature=np.concatenate([p[0] for p in parts]),
+            threshold=np.concatenate([p[1] for p in parts]),
+            left=np.concatenate([p[2] + off for p, off in zip(parts, offsets)]),
+            right=np.concatenate([p[3] + off for p, off in zip(parts, offsets)]),
+            value=np.concatenate([p[4] for p in parts]),
+            roots=offsets,
+            depth=depth,
+            info=info,
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def apply(self, X):
+        """Return leaf node ids, shape (n_samples, n_trees)"""
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        positive = self.value[self.apply(X)].mean(axis=1, dtype=np.float64)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def to_arrays(self):
+        return {
+            'feature': self.feature, 'threshold': self.threshold,
+            'left': self.left, 'right': self.right, 'value': self.value,
+            'roots': self.roots, 'depth': np.array(self.depth),
+        }
+
+
+class CompactLinear:
+    """Logistic model stored as float32 coefficients"""
+
+    kind = 'linear'
+
+    def __init__(self, coef, intercept, info=None):
+        self.coef = np.asarray(coef, dtype=np.float32).ravel()
+        self.intercept = np.float32(np.ravel(intercept)[0])
+        self.info = info or {}
+
+    @classmethod
+    def from_estimator(cls, estimator, info=None):
+        return cls(estimator.coef_, estimator.intercept_, info=info)
+
+    def predict_proba(self, X):
+        z = np.asarray(X, dtype=np.float32) @ self.coef + self.intercept
+        positive = 1.0 / (1.0 + np.exp(-z.astype(np.float64)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def to_arrays(self):
+        return {'coef': self.coef, 'intercept': np.array(self.intercept)}
+
+
+def artifact_fingerprint(scaler, training_date):
+    """
+    Identifies the saved model a compact artifact was built from: the scaler
+    statistics it expects its inputs in, plus the model's training date
+    """
+    digest = hashlib.sha256()
+    digest.update(np.asarray(scaler.mean_, dtype=np.float64).tobytes())
+    digest.update(np.asarray(scaler.scale_, dtype=np.float64).tobytes())
+    digest.update(str(training_date).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def save_compact(model, path):
+    """Write a compact model to an .npz file (no pickle involved)"""
+    arrays = model.to_arrays()
+    arrays['kind'] = np.array(model.kind)
+    arrays['info'] = np.array(json.dumps(model.info))
+    np.savez(path, **arrays)
+
+
+def load_compact(path):
+    """Load a compact model written by `save_compact`"""
+    with np.load(path, allow_pickle=False) as data:
+        kind = str(data['kind'])
+        info = json.loads(str(data['info']))
+        if kind == 'linear':
+            return CompactLinear(data['coef'], data['intercept'], info=info)
+        return CompactForest(
+            data['feature'], data['threshold'], data['left'], data['right'],
+            data['value'], data['roots'], int(data['depth']), info=info
+        )
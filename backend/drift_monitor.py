@@ -0,0 +1,184 @@
+"""
+Online feature drift monitoring
+Fixed-memory streaming statistics per feature, scored against the training reference profile
+"""
+import json
+import math
+import os
+import threading
+from bisect import bisect_left
+
+# Population Stability Index bands commonly used for drift alerts
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+EPSILON = 1e-4
+
+
+class FeatureStats:
+    """
+    Streaming statistics for one feature: fixed-bin histogram (or category
+    counts) plus Welford running mean/variance. Memory does not grow with
+    traffic and two instances over the same reference can be merged.
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+        self.is_categorical = reference['type'] == 'categorical'
+        if self.is_categorical:
+            self.categories = {c: i for i, c in enumerate(reference['categories'])}
+            # Last slot counts values never seen in training
+            self.counts = [0] * (len(self.categories) + 1)
+        else:
+            self.edges = reference['bin_edges']
+            self.counts = [0] * (len(self.edges) + 1)
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value):
+        if self.is_categorical:
+            self.counts[self.categories.get(int(round(value)), len(self.categories))] += 1
+        else:
+            self.counts[bisect_left(self.edges, value)] += 1
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Combine counts and moments from another instance (Chan et al. parallel update)"""
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def state(self):
+        return {'counts': self.counts, 'n': self.n, 'mean': self.mean, 'm2': self.m2}
+
+    @classmethod
+    def from_state(cls, reference, state):
+        stats = cls(reference)
+        stats.counts = list(state['counts'])
+        stats.n, stats.mean, stats.m2 = state['n'], state['mean'], state['m2']
+        return stats
+
+    def drift(self):
+        """PSI and KS-style distance of the observed distribution against the reference"""
+        expected = list(self.reference['proportions'])
+        observed = [c / self.n for c in self.counts]
+        if self.is_categorical:
+            expected.append(0.0)
+
+        psi = sum(
+            (o - e) * math.log(max(o, EPSILON) / max(e, EPSILON))
+            for o, e in zip(observed, expected)
+        )
+        # `distance` is total variation for categories (no order for a CDF),
+        # otherwise a KS statistic evaluated at the reference bin edges
+        if self.is_categorical:
+            distance = 0.5 * sum(abs(o - e) for o, e in zip(observed, expected))
+        else:
+            distance, cum_o, cum_e = 0.0, 0.0, 0.0
+            for o, e in zip(observed, expected):
+                cum_o += o
+                cum_e += e
+                distance = max(distance, abs(cum_o - cum_e))
+
+        std = math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+        reference_std = self.reference['std'] or 1.0
+        return {
+            'type': self.reference['type'],
+            'psi': round(psi, 4),
+            'distance': round(distance, 4),
+            'mean': round(self.mean, 4),
+            'std': round(std, 4),
+            'reference_mean': round(self.reference['mean'], 4),
+            'reference_std': round(self.reference['std'], 4),
+            'mean_shift': round((self.mean - self.reference['mean']) / reference_std, 4),
+            'status': drift_status(psi)
+        }
+
+
+def drift_status(psi):
+    """Map a PSI value to a drift status"""
+    if psi < PSI_MODERATE:
+        return "Stable"
+    elif psi < PSI_SIGNIFICANT:
+        return "Moderate Drift"
+    else:
+        return "Significant Drift"
+
+
+class DriftMonitor:
+    """Thread-safe collection of FeatureStats for one model's input features"""
+
+    def __init__(self, reference_profile, feature_names, min_samples=30):
+        self.reference_profile = reference_profile
+        self.feature_names = list(feature_names)
+        self.min_samples = min_samples
+        self.stats = [FeatureStats(reference_profile['features'][name]) for name in self.feature_names]
+        self._lock = threading.Lock()
+
+    def update(self, values):
+        """Record one request's raw feature values, in metadata `features` order"""
+        with self._lock:
+            for stats, value in zip(self.stats, values):
+                stats.update(float(value))
+
+    def update_batch(self, rows):
+        """Record several requests' raw feature rows"""
+        with self._lock:
+            for values in rows:
+                for stats, value in zip(self.stats, values):
+                    stats.update(float(value))
+
+    def merge(self, other):
+        with self._lock:
+            for stats, other_stats in zip(self.stats, other.stats):
+                stats.merge(other_stats)
+
+    def save_state(self, path):
+        """Atomically write the streaming statistics so another process can merge them"""
+        with self._lock:
+            state = {name: stats.state() for name, stats in zip(self.feature_names, self.stats)}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def load_state(self, path):
+        """Merge statistics written by save_state() into this monitor"""
+        with open(path, 'r') as f:
+            state = json.load(f)
+        with self._lock:
+            for name, stats in zip(self.feature_names, self.stats):
+                stats.merge(FeatureStats.from_state(stats.reference, state[name]))
+
+    @property
+    def n_observations(self):
+        return self.stats[0].n if self.stats else 0
+
+    def report(self):
+        with self._lock:
+            n = self.n_observations
+            if n < self.min_samples:
+                return {
+                    'n_observations': n,
+                    'reference_samples': self.reference_profile['n_samples'],
+                    'status': "Insufficient Data",
+                    'features': {}
+                }
+            features = {name: stats.drift() for name, stats in zip(self.feature_names, self.stats)}
+
+        max_psi = max(f['psi'] for f in features.values())
+        return {
+            'n_observations': n,
+            'reference_samples': self.reference_profile['n_samples'],
+            'status': drift_status(max_psi),
+            'max_psi': max_psi,
+            'features': features
+        }
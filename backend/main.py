@@ -2,14 +2,33 @@
 FastAPI Backend for Healthcare Decision Support System
 Provides REST API endpoints for ML-based diagnosis predictions
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, BackgroundTasks, File, Form, UploadFile
+from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field, validator
 from typing import Dict, List, Optional
+import os
+import sys
+import shutil
+import asyncio
+import threading
 import pickle
 import json
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Make sibling modules importable for both `python backend/main.py` and `uvicorn backend.main:app`
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from compact_forest import artifact_fingerprint, load_compact
+from tree_explainer import TreeExplainer
+from drift_monitor import DriftMonitor
+from audit_log import AuditLog
+from admission import AdmissionController, AdmissionMiddleware
+from batch_jobs import JobManager
+from worker_pool import WorkerPool, pool_memory
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -18,6 +37,29 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Admission control: per-model concurrency limit with a bounded, deadline-aware queue.
+# Added before CORS so shed responses still carry CORS headers.
+ADMISSION_CONTROLLERS = {
+    model_type: AdmissionController(
+        max_concurrency=int(os.getenv("ADMISSION_MAX_CONCURRENCY", str(os.cpu_count() or 1))),
+        max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "64")),
+        queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+    )
+    for model_type in ['diabetes', 'heart_disease']
+}
+# Screening scores both models, so it takes a slot from each model's controller
+app.add_middleware(
+    AdmissionMiddleware,
+    controllers=ADMISSION_CONTROLLERS,
+    shared={'screening': ('diabetes', 'heart_disease')}
+)
+
+# Model scoring runs in a dedicated pool so the event loop stays free for light endpoints
+INFERENCE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("INFERENCE_THREADS", str(os.cpu_count() or 1))),
+    thread_name_prefix="inference"
+)
+
 # Configure CORS for frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +73,11 @@ app.add_middleware(
 MODELS = {}
 SCALERS = {}
 METADATA = {}
+EXPLAINERS = {}
+DRIFT_MONITORS = {}
+
+# "full" serves the pickled model, "compact" serves models/<type>_compact.npz when present
+MODEL_VARIANT = os.getenv("MODEL_VARIANT", "full")
 
 def load_model_artifacts():
     """Load trained models, scalers, and metadata"""
@@ -38,11 +85,6 @@ def load_model_artifacts():
     
     for model_type in model_types:
         try:
-            # Load model
-            model_path = f"models/{model_type}_model.pkl"
-            with open(model_path, 'rb') as f:
-                MODELS[model_type] = pickle.load(f)
-            
             # Load scaler
             scaler_path = f"models/{model_type}_scaler.pkl"
             with open(scaler_path, 'rb') as f:
@@ -53,6 +95,37 @@ def load_model_artifacts():
             with open(metadata_path, 'r') as f:
                 METADATA[model_type] = json.load(f)
             
+            # Load model; a compact artifact is only used if it was built from the saved model and scaler
+            compact_path = Path(f"models/{model_type}_compact.npz")
+            MODELS.pop(model_type, None)
+            if MODEL_VARIANT == "compact" and compact_path.exists():
+                compact = load_compact(compact_path)
+                expected = artifact_fingerprint(SCALERS[model_type], METADATA[model_type]['training_date'])
+                if compact.info.get('fingerprint') == expected:
+                    MODELS[model_type] = compact
+                else:
+                    print(f"⚠️ {compact_path} does not match the saved {model_type} model, serving the full model")
+            if model_type not in MODELS:
+                model_path = f"models/{model_type}_model.pkl"
+                with open(model_path, 'rb') as f:
+                    MODELS[model_type] = pickle.load(f)
+            
+            compact_info = getattr(MODELS[model_type], 'info', None)
+            if compact_info:
+                METADATA[model_type]['model_name'] += f" (compact: {compact_info['variant']})"
+                METADATA[model_type]['compact_metrics'] = compact_info['metrics']
+            
+            # Precompute node expectations so explanations cost about as much as a prediction
+            EXPLAINERS[model_type] = TreeExplainer.from_model(
+                MODELS[model_type], len(METADATA[model_type]['features'])
+            )
+            
+            # Load training reference profile for drift monitoring (optional)
+            reference_path = Path(f"models/{model_type}_reference.json")
+            if reference_path.exists():
+                with open(reference_path, 'r') as f:
+                    DRIFT_MONITORS[model_type] = DriftMonitor(json.load(f), METADATA[model_type]['features'])
+            
             print(f"✓ Loaded {model_type} model successfully")
         except Exception as e:
             print(f"⚠️ Failed to load {model_type} model: {e}")
@@ -60,6 +133,94 @@ def load_model_artifacts():
 # Load models at startup
 load_model_artifacts()
 
+# Audit log of every prediction, buffered in memory and flushed by a background thread
+AUDIT_LOG = AuditLog(
+    directory=os.getenv("AUDIT_LOG_DIR", "logs/audit"),
+    capacity=int(os.getenv("AUDIT_BUFFER_SIZE", "10000")),
+    flush_interval=float(os.getenv("AUDIT_FLUSH_SECONDS", "1.0")),
+    max_file_bytes=int(float(os.getenv("AUDIT_MAX_FILE_MB", "64")) * 1024 * 1024),
+    rotate_seconds=float(os.getenv("AUDIT_ROTATE_SECONDS", "3600")),
+    overflow=os.getenv("AUDIT_OVERFLOW", "drop_oldest")
+)
+
+@app.on_event("startup")
+def start_audit_log():
+    AUDIT_LOG.start()
+
+@app.on_event("shutdown")
+def stop_audit_log():
+    AUDIT_LOG.stop()
+
+# Background batch-scoring jobs; a small worker limit protects interactive /predict latency
+JOB_MANAGER = JobManager(
+    directory=os.getenv("JOBS_DIR", "jobs"),
+    score_fn=lambda model_type, features: run_inference(model_type, features)[:2],
+    features_fn=lambda model_type: METADATA[model_type]['features'],
+    max_concurrent=int(os.getenv("JOBS_MAX_CONCURRENT", "1")),
+    chunk_size=int(os.getenv("JOBS_CHUNK_SIZE", "10000")),
+    lease_seconds=float(os.getenv("JOBS_LEASE_SECONDS", "60"))
+)
+# Server-side datasets may only be read from this directory
+JOBS_DATA_DIR = Path(os.getenv("JOBS_DATA_DIR", "data")).resolve()
+
+# Set in each forked worker by init_worker(); WORKER_INDEX stays None in a single-process server
+WORKER_INDEX = None
+RUN_JOBS = True
+
+def init_worker(index: int):
+    """
+    Per-worker setup after fork: own audit files, and only worker 0 runs batch jobs so
+    JOBS_MAX_CONCURRENT stays a global limit (other workers just submit to the shared store)
+    """
+    global WORKER_INDEX, RUN_JOBS
+    WORKER_INDEX = index
+    RUN_JOBS = index == 0
+    AUDIT_LOG.file_tag = f"w{index}"
+
+    # A worker respawned after a crash carries on from its predecessor's last shared drift state
+    DRIFT_STATE_DIR.mkdir(parents=True, exist_ok=True)
+    for model_type, monitor in DRIFT_MONITORS.items():
+        if drift_state_path(model_type, index).exists():
+            monitor.load_state(drift_state_path(model_type, index))
+
+@app.on_event("startup")
+def start_job_workers():
+    JOB_MANAGER.start(run_jobs=RUN_JOBS)
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    JOB_MANAGER.stop()
+
+# Workers publish their drift statistics here so /drift can merge the traffic of all of them
+DRIFT_STATE_DIR = Path(os.getenv("DRIFT_STATE_DIR", "logs/drift"))
+DRIFT_SHARE_SECONDS = float(os.getenv("DRIFT_SHARE_SECONDS", "5"))
+DRIFT_SHARE_STOP = threading.Event()
+
+def drift_state_path(model_type: str, index: int) -> Path:
+    return DRIFT_STATE_DIR / f"{model_type}-w{index}.json"
+
+def share_drift_state():
+    for model_type, monitor in DRIFT_MONITORS.items():
+        try:
+            monitor.save_state(drift_state_path(model_type, WORKER_INDEX))
+        except OSError as e:
+            print(f"⚠️ Failed to share {model_type} drift state: {e}")
+
+def share_drift_periodically():
+    while not DRIFT_SHARE_STOP.wait(DRIFT_SHARE_SECONDS):
+        share_drift_state()
+
+@app.on_event("startup")
+def start_drift_sharing():
+    if WORKER_INDEX is not None:
+        threading.Thread(target=share_drift_periodically, name="drift-share", daemon=True).start()
+
+@app.on_event("shutdown")
+def stop_drift_sharing():
+    if WORKER_INDEX is not None:
+        DRIFT_SHARE_STOP.set()
+        share_drift_state()
+
 # Pydantic Models for Request/Response
 
 class DiabetesInput(BaseModel):
@@ -118,6 +279,26 @@ class HeartDiseaseInput(BaseModel):
             }
         }
 
+class ScreeningInput(DiabetesInput, HeartDiseaseInput):
+    """Input schema for combined screening: union of diabetes and heart disease fields"""
+    
+    class Config:
+        schema_extra = {
+            "example": {
+                **DiabetesInput.Config.schema_extra["example"],
+                **HeartDiseaseInput.Config.schema_extra["example"]
+            }
+        }
+
+class ScreeningBatchInput(BaseModel):
+    """Input schema for batch screening"""
+    patients: List[ScreeningInput]
+
+class FeatureExplanation(BaseModel):
+    """Per-feature contributions to the predicted probability"""
+    base_value: float
+    contributions: Dict[str, float]
+
 class PredictionResponse(BaseModel):
     """Response schema for predictions"""
     diagnosis: str
@@ -128,6 +309,16 @@ class PredictionResponse(BaseModel):
     recommendations: List[str]
     model_used: str
     feature_values: Dict
+    explanation: Optional[FeatureExplanation] = None
+
+class ScreeningResponse(BaseModel):
+    """Response schema for combined screening of one patient"""
+    diabetes: PredictionResponse
+    heart_disease: PredictionResponse
+
+class ScreeningBatchResponse(BaseModel):
+    """Response schema for batch screening"""
+    results: List[ScreeningResponse]
 
 class ModelInfoResponse(BaseModel):
     """Response schema for model information"""
@@ -208,6 +399,101 @@ def get_confidence(probability: float) -> str:
     else:
         return "Low"
 
+def explain_prediction(model_type: str, features_scaled: np.ndarray) -> List[FeatureExplanation]:
+    """
+    Per-feature contributions for each row of an already scaled feature matrix
+    """
+    explainer = EXPLAINERS.get(model_type)
+    if explainer is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Explanations are not available for the {model_type} model"
+        )
+    
+    feature_names = METADATA[model_type]['features']
+    _, contributions = explainer.explain(features_scaled)
+    return [
+        FeatureExplanation(
+            base_value=round(explainer.base_value, 4),
+            contributions={name: round(float(value), 4) for name, value in zip(feature_names, row)}
+        )
+        for row in contributions
+    ]
+
+def run_inference(model_type: str, features: np.ndarray, explain: bool = False):
+    """
+    Scale raw feature rows and score them with the served model (runs in INFERENCE_POOL)
+    """
+    features_scaled = SCALERS[model_type].transform(features)
+    predictions = MODELS[model_type].predict(features_scaled)
+    probabilities = MODELS[model_type].predict_proba(features_scaled)[:, 1]
+    explanations = explain_prediction(model_type, features_scaled) if explain else None
+    return predictions, probabilities, explanations
+
+DIAGNOSIS_LABELS = {
+    'diabetes': ("No Diabetes", "Diabetes"),
+    'heart_disease': ("No Heart Disease", "Heart Disease Risk")
+}
+
+# Largest number of patients accepted by one batch screening request
+SCREENING_MAX_BATCH = int(os.getenv("SCREENING_MAX_BATCH", "1000"))
+
+async def screen_patients(patients: List[ScreeningInput], background_tasks: BackgroundTasks,
+                          explain: bool = False) -> List[ScreeningResponse]:
+    """
+    Score every patient with both models: one feature matrix per model, built in
+    metadata `features` order, and both models scored concurrently in the inference pool
+    """
+    model_types = list(DIAGNOSIS_LABELS)
+    for model_type in model_types:
+        if model_type not in MODELS:
+            raise HTTPException(status_code=503, detail=f"Model '{model_type}' is not loaded")
+    
+    patient_dicts = [patient.dict() for patient in patients]
+    matrices = {
+        model_type: np.array(
+            [[values[name] for name in METADATA[model_type]['features']] for values in patient_dicts],
+            dtype=float
+        )
+        for model_type in model_types
+    }
+    
+    loop = asyncio.get_running_loop()
+    scored = await asyncio.gather(*[
+        loop.run_in_executor(INFERENCE_POOL, run_inference, model_type, matrices[model_type], explain)
+        for model_type in model_types
+    ])
+    
+    responses = {model_type: [] for model_type in model_types}
+    for model_type, (predictions, probabilities, explanations) in zip(model_types, scored):
+        feature_names = METADATA[model_type]['features']
+        model_name = METADATA[model_type]['model_name']
+        for i, values in enumerate(patient_dicts):
+            prediction = int(predictions[i])
+            probability = float(probabilities[i])
+            feature_dict = {name: values[name] for name in feature_names}
+            responses[model_type].append(PredictionResponse(
+                diagnosis=DIAGNOSIS_LABELS[model_type][prediction],
+                prediction=prediction,
+                probability=round(probability, 4),
+                confidence=get_confidence(probability),
+                risk_level=get_risk_level(probability),
+                recommendations=get_recommendations(model_type, prediction, probability, feature_dict),
+                model_used=model_name,
+                feature_values=feature_dict,
+                explanation=explanations[i] if explain else None
+            ))
+            AUDIT_LOG.record(model_type, model_name, feature_dict, prediction, probability)
+        
+        # Update drift statistics after the response has been sent
+        if model_type in DRIFT_MONITORS:
+            background_tasks.add_task(DRIFT_MONITORS[model_type].update_batch, matrices[model_type])
+    
+    return [
+        ScreeningResponse(diabetes=diabetes, heart_disease=heart_disease)
+        for diabetes, heart_disease in zip(responses['diabetes'], responses['heart_disease'])
+    ]
+
 # API Routes
 
 @app.get("/")
@@ -221,9 +507,11 @@ async def root():
     }
 
 @app.post("/predict/diabetes", response_model=PredictionResponse)
-async def predict_diabetes(input_data: DiabetesInput):
+async def predict_diabetes(input_data: DiabetesInput, background_tasks: BackgroundTasks,
+                           explain: bool = False):
     """
     Predict diabetes risk based on patient data
+    Pass explain=true to include per-feature contributions to the probability
     """
     try:
         # Convert input to array
@@ -238,17 +526,26 @@ async def predict_diabetes(input_data: DiabetesInput):
             input_data.Age
         ]])
         
-        # Scale features
-        features_scaled = SCALERS['diabetes'].transform(features)
-        
-        # Make prediction
-        prediction = int(MODELS['diabetes'].predict(features_scaled)[0])
-        probability = float(MODELS['diabetes'].predict_proba(features_scaled)[0][1])
+        # Scale features and make prediction in the inference pool
+        predictions, probabilities, explanations = await asyncio.get_running_loop().run_in_executor(
+            INFERENCE_POOL, run_inference, 'diabetes', features, explain
+        )
+        prediction = int(predictions[0])
+        probability = float(probabilities[0])
         
         # Get recommendations
         feature_dict = input_data.dict()
         recommendations = get_recommendations('diabetes', prediction, probability, feature_dict)
         
+        # Optional per-feature attributions
+        explanation = explanations[0] if explain else None
+        
+        # Update drift statistics after the response has been sent
+        if 'diabetes' in DRIFT_MONITORS:
+            background_tasks.add_task(DRIFT_MONITORS['diabetes'].update, features[0])
+        
+        AUDIT_LOG.record('diabetes', METADATA['diabetes']['model_name'], feature_dict, prediction, probability)
+        
         return PredictionResponse(
             diagnosis="Diabetes" if prediction == 1 else "No Diabetes",
             prediction=prediction,
@@ -257,16 +554,21 @@ async def predict_diabetes(input_data: DiabetesInput):
             risk_level=get_risk_level(probability),
             recommendations=recommendations,
             model_used=METADATA['diabetes']['model_name'],
-            feature_values=feature_dict
+            feature_values=feature_dict,
+            explanation=explanation
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 @app.post("/predict/heart-disease", response_model=PredictionResponse)
-async def predict_heart_disease(input_data: HeartDiseaseInput):
+async def predict_heart_disease(input_data: HeartDiseaseInput, background_tasks: BackgroundTasks,
+                                explain: bool = False):
     """
     Predict heart disease risk based on patient data
+    Pass explain=true to include per-feature contributions to the probability
     """
     try:
         # Convert input to array
@@ -284,17 +586,26 @@ async def predict_heart_disease(input_data: HeartDiseaseInput):
             input_data.ST_Slope
         ]])
         
-        # Scale features
-        features_scaled = SCALERS['heart_disease'].transform(features)
-        
-        # Make prediction
-        prediction = int(MODELS['heart_disease'].predict(features_scaled)[0])
-        probability = float(MODELS['heart_disease'].predict_proba(features_scaled)[0][1])
+        # Scale features and make prediction in the inference pool
+        predictions, probabilities, explanations = await asyncio.get_running_loop().run_in_executor(
+            INFERENCE_POOL, run_inference, 'heart_disease', features, explain
+        )
+        prediction = int(predictions[0])
+        probability = float(probabilities[0])
         
         # Get recommendations
         feature_dict = input_data.dict()
         recommendations = get_recommendations('heart_disease', prediction, probability, feature_dict)
         
+        # Optional per-feature attributions
+        explanation = explanations[0] if explain else None
+        
+        # Update drift statistics after the response has been sent
+        if 'heart_disease' in DRIFT_MONITORS:
+            background_tasks.add_task(DRIFT_MONITORS['heart_disease'].update, features[0])
+        
+        AUDIT_LOG.record('heart_disease', METADATA['heart_disease']['model_name'], feature_dict, prediction, probability)
+        
         return PredictionResponse(
             diagnosis="Heart Disease Risk" if prediction == 1 else "No Heart Disease",
             prediction=prediction,
@@ -303,12 +614,120 @@ async def predict_heart_disease(input_data: HeartDiseaseInput):
             risk_level=get_risk_level(probability),
             recommendations=recommendations,
             model_used=METADATA['heart_disease']['model_name'],
-            feature_values=feature_dict
+            feature_values=feature_dict,
+            explanation=explanation
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@app.post("/predict/screening", response_model=ScreeningResponse)
+async def predict_screening(input_data: ScreeningInput, background_tasks: BackgroundTasks,
+                            explain: bool = False):
+    """
+    Screen one patient for both diabetes and heart disease in a single request
+    Pass explain=true to include per-feature contributions to the probability
+    """
+    try:
+        return (await screen_patients([input_data], background_tasks, explain))[0]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@app.post("/predict/screening/batch", response_model=ScreeningBatchResponse)
+async def predict_screening_batch(input_data: ScreeningBatchInput, background_tasks: BackgroundTasks,
+                                  explain: bool = False):
+    """
+    Screen a batch of patients; each model is scored once over the whole batch
+    """
+    if not input_data.patients:
+        raise HTTPException(status_code=422, detail="At least one patient is required")
+    if len(input_data.patients) > SCREENING_MAX_BATCH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(input_data.patients)} patients exceeds limit of {SCREENING_MAX_BATCH}"
         )
     
+    try:
+        return ScreeningBatchResponse(
+            results=await screen_patients(input_data.patients, background_tasks, explain)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
+@app.post("/jobs")
+async def submit_job(model_type: str = Form(...), file: Optional[UploadFile] = File(None),
+                     path: Optional[str] = Form(None)):
+    """
+    Submit a CSV dataset for background scoring, either uploaded or as a
+    server-side path under JOBS_DATA_DIR. Returns the job ID and status.
+    """
+    if model_type not in MODELS:
+        raise HTTPException(status_code=404, detail=f"Model '{model_type}' not found")
+    if (file is None) == (path is None):
+        raise HTTPException(status_code=422, detail="Provide exactly one of 'file' or 'path'")
+    
+    if file is not None:
+        source_path = JOB_MANAGER.new_upload_path()
+        with open(source_path, 'wb') as f:
+            # Large uploads are copied off the event loop
+            await run_in_threadpool(shutil.copyfileobj, file.file, f, 1024 * 1024)
+    else:
+        source_path = (JOBS_DATA_DIR / path).resolve()
+        if not source_path.is_relative_to(JOBS_DATA_DIR) or not source_path.is_file():
+            raise HTTPException(status_code=404, detail=f"Dataset '{path}' not found")
+    
+    try:
+        return JOB_MANAGER.submit(model_type, source_path)
+    except ValueError as e:
+        if file is not None:
+            source_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.get("/jobs")
+async def list_jobs():
+    """
+    List recent batch-scoring jobs
+    """
+    return [JOB_MANAGER.status(job['id']) for job in JOB_MANAGER.store.list()]
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Progress of a batch-scoring job: rows done, rows/sec and ETA
+    """
+    status = JOB_MANAGER.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return status
+
+@app.get("/jobs/{job_id}/results")
+async def get_job_results(job_id: str):
+    """
+    Download the scored CSV of a completed job
+    """
+    job = JOB_MANAGER.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    if job['status'] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job '{job_id}' is {job['status']}")
+    return FileResponse(job['result_path'], media_type="text/csv", filename=f"{job_id}_results.csv")
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job
+    """
+    status = JOB_MANAGER.cancel(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return status
+
 @app.get("/model-info/{model_type}", response_model=ModelInfoResponse)
 async def get_model_info(model_type: str):
     """
@@ -326,6 +745,63 @@ async def get_model_info(model_type: str):
         training_date=metadata['training_date']
     )
 
+@app.get("/drift/{model_type}")
+async def get_drift(model_type: str):
+    """
+    Drift of recent prediction inputs against the training reference profile,
+    merged over all workers when serving with several
+    """
+    if model_type not in METADATA:
+        raise HTTPException(status_code=404, detail=f"Model '{model_type}' not found")
+    if model_type not in DRIFT_MONITORS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No reference profile for '{model_type}', retrain the model to generate one"
+        )
+    
+    monitor = DRIFT_MONITORS[model_type]
+    if WORKER_INDEX is None:
+        return monitor.report()
+    
+    # Other workers' states are at most DRIFT_SHARE_SECONDS old; this worker's is current
+    monitor.save_state(drift_state_path(model_type, WORKER_INDEX))
+    combined = DriftMonitor(monitor.reference_profile, monitor.feature_names, monitor.min_samples)
+    paths = sorted(DRIFT_STATE_DIR.glob(f"{model_type}-w*.json"))
+    for path in paths:
+        combined.load_state(path)
+    return {**combined.report(), 'workers': len(paths)}
+
+@app.get("/audit/stats")
+async def get_audit_stats():
+    """
+    Audit log counters: recorded, written, dropped and buffered records
+    (per worker when serving with several; worker_index tells them apart)
+    """
+    return {**AUDIT_LOG.stats(), 'worker_index': WORKER_INDEX}
+
+@app.get("/admission/stats")
+async def get_admission_stats():
+    """
+    Per-model admission metrics: active requests, queue depth, wait times and shed counts
+    (per worker when serving with several; worker_index tells them apart)
+    """
+    return {
+        'worker_index': WORKER_INDEX,
+        **{model_type: controller.stats() for model_type, controller in ADMISSION_CONTROLLERS.items()}
+    }
+
+@app.get("/workers/memory")
+async def get_worker_memory():
+    """
+    RSS vs. shared memory of every serving process, and the worker that answered
+    """
+    return {
+        'worker_index': WORKER_INDEX,
+        'pid': os.getpid(),
+        'cpus': sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else None,
+        **pool_memory(in_pool=WORKER_INDEX is not None)
+    }
+
 @app.get("/models")
 async def list_models():
     """
@@ -350,4 +826,17 @@ if __name__ == "__main__":
     print("📖 Alternative docs at: http://localhost:8000/redoc")
     print("\n" + "="*70 + "\n")
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    workers = int(os.getenv("WORKERS", "1"))
+    if workers > 1 and hasattr(os, "fork"):
+        # Drift state of a previous run must not be merged into this one
+        shutil.rmtree(DRIFT_STATE_DIR, ignore_errors=True)
+        # Models are already loaded above; forked workers share them copy-on-write
+        served = WorkerPool(
+            app, host="0.0.0.0", port=8000, workers=workers,
+            cpu_pinning=os.getenv("CPU_PINNING", "0") == "1",
+            on_fork=init_worker, log_level="info"
+        ).run()
+        if not served:
+            sys.exit(1)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
@@ -0,0 +1,159 @@
+"""
+Per-prediction feature attributions for tree ensembles
+Decision-path contributions computed over flat node arrays, vectorized across rows and trees
+"""
+import json
+
+import numpy as np
+
+from compact_forest import CompactForest
+
+
+def _forest_from_booster(booster):
+    """
+    Flatten a binary:logistic XGBoost booster into CompactForest arrays plus its base
+    margin. Internal node values are the cover-weighted mean of their children, so
+    decision-path deltas are defined the same way as for sklearn forests.
+    """
+    learner = json.loads(booster.save_raw('json'))['learner']
+    if learner['objective']['name'] != 'binary:logistic':
+        raise ValueError(f"Unsupported XGBoost objective '{learner['objective']['name']}'")
+    base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+    base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+    feature, threshold, left, right, value, roots = [], [], [], [], [], []
+    depth = offset = 0
+    for tree in learner['gradient_booster']['model']['trees']:
+        roots.append(offset)
+        children_left = np.asarray(tree['left_children'])
+        children_right = np.asarray(tree['right_children'])
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float64)
+        cover = np.asarray(tree['sum_hessian'], dtype=np.float64)
+        is_leaf = children_left == -1
+        n_nodes = len(children_left)
+        node_ids = np.arange(n_nodes)
+
+        # Children always have larger ids than their parent, so a reverse pass fills values bottom-up
+        node_value = np.where(is_leaf, conditions, 0.0)
+        node_depth = np.zeros(n_nodes, dtype=np.int64)
+        for node in range(n_nodes):
+            if not is_leaf[node]:
+                node_depth[children_left[node]] = node_depth[children_right[node]] = node_depth[node] + 1
+        for node in reversed(range(n_nodes)):
+            if not is_leaf[node]:
+                l, r = children_left[node], children_right[node]
+                node_value[node] = (cover[l] * node_value[l] + cover[r] * node_value[r]) / (cover[l] + cover[r])
+
+        # XGBoost goes left on x < t; for float32 inputs that is x <= the float32 just below t
+        split = np.nextafter(conditions.astype(np.float32), np.float32(-np.inf))
+        feature.append(np.where(is_leaf, 0, tree['split_indices']))
+        threshold.append(np.where(is_leaf, np.inf, split))
+        left.append(np.where(is_leaf, node_ids, children_left) + offset)
+        right.append(np.where(is_leaf, node_ids, children_right) + offset)
+        value.append(node_value)
+        depth = max(depth, int(node_depth.max()))
+        offset += n_nodes
+
+    forest = CompactForest(
+        feature=np.concatenate(feature), threshold=np.concatenate(threshold),
+        left=np.concatenate(left), right=np.concatenate(right),
+        value=np.concatenate(value), roots=roots, depth=depth
+    )
+    return forest, base_margin
+
+
+class TreeExplainer:
+    """
+    Attributes a prediction to features by following each row's decision path:
+    every split moves the expected tree output from the parent node's value to
+    the child's, and that change is credited to the split feature. Per-node
+    expectations and deltas are precomputed once, so explaining costs about as
+    much as predicting. For every row, base_value + sum(contributions) equals
+    the predicted positive-class probability.
+
+    Forests average tree probabilities. Boosted models (`base_margin` set) sum
+    tree margins instead; their log-odds contributions are scaled by
+    (p - base_value) / (margin - base_margin) so they still add up to the
+    predicted probability.
+    """
+
+    def __init__(self, forest, n_features, base_margin=None):
+        self.forest = forest
+        self.n_features = n_features
+        self.base_margin = base_margin
+
+        # Node expectation deltas: delta[child] = E[child] - E[parent], credited to parent's split feature
+        n_nodes = forest.n_nodes
+        parent = np.full(n_nodes, -1, dtype=np.int64)
+        internal = np.flatnonzero(forest.left != np.arange(n_nodes))
+        parent[forest.left[internal]] = internal
+        parent[forest.right[internal]] = internal
+
+        has_parent = parent >= 0
+        self.delta = np.zeros(n_nodes, dtype=np.float64)
+        self.delta[has_parent] = forest.value[has_parent] - forest.value[parent[has_parent]]
+        self.split_feature = np.zeros(n_nodes, dtype=np.int64)
+        self.split_feature[has_parent] = forest.feature[parent[has_parent]]
+        if base_margin is None:
+            self.base_value = float(forest.value[forest.roots].mean())
+        else:
+            self.root_margin = base_margin + float(forest.value[forest.roots].astype(np.float64).sum())
+            self.base_value = float(1.0 / (1.0 + np.exp(-self.root_margin)))
+
+    @classmethod
+    def from_model(cls, model, n_features):
+        """Build an explainer for a served model, or return None if it is not a supported tree ensemble"""
+        if isinstance(model, CompactForest):
+            return cls(model, n_features)
+        estimators = getattr(model, 'estimators_', None)
+        if estimators is not None and all(hasattr(est, 'tree_') for est in estimators):
+            return cls(CompactForest.from_estimators(estimators), n_features)
+        if hasattr(model, 'get_booster'):
+            try:
+                forest, base_margin = _forest_from_booster(model.get_booster())
+            except ValueError:
+                return None
+            return cls(forest, n_features, base_margin=base_margin)
+        return None
+
+    def explain(self, X):
+        """
+        Return (probabilities, contributions) for a batch of scaled rows;
+        contributions has shape (n_samples, n_features)
+        """
+        forest = self.forest
+        X = np.asarray(X, dtype=np.float32)
+        n_samples = len(X)
+        rows = np.arange(n_samples)[:, None]
+        nodes = np.broadcast_to(forest.roots, (n_samples, forest.n_trees)).copy()
+        contributions = np.zeros(n_samples * self.n_features, dtype=np.float64)
+        row_offset = rows * self.n_features
+
+        for _ in range(forest.depth):
+            go_left = X[rows, forest.feature[nodes]] <= forest.threshold[nodes]
+            next_nodes = np.where(go_left, forest.left[nodes], forest.right[nodes])
+            moved = next_nodes != nodes
+            if not moved.any():
+                break
+            stepped = next_nodes[moved]
+            contributions += np.bincount(
+                np.broadcast_to(row_offset, nodes.shape)[moved] + self.split_feature[stepped],
+                weights=self.delta[stepped],
+                minlength=len(contributions)
+            )
+            nodes = next_nodes
+
+        contributions = contributions.reshape(n_samples, self.n_features)
+        if self.base_margin is None:
+            return forest.value[nodes].mean(axis=1, dtype=np.float64), contributions / forest.n_trees
+
+        margins = self.base_margin + forest.value[nodes].sum(axis=1, dtype=np.float64)
+        probabilities = 1.0 / (1.0 + np.exp(-margins))
+        margin_change = margins - self.root_margin
+        # Secant of the sigmoid; its derivative where the margin did not move
+        flat = np.abs(margin_change) < 1e-12
+        scale = np.where(
+            flat, self.base_value * (1.0 - self.base_value),
+            (probabilities - self.base_value) / np.where(flat, 1.0, margin_change)
+        )
+        return probabilities, contributions * scale[:, None]
@@ -0,0 +1,199 @@
+"""
+Pre-fork multi-worker serving
+Model artifacts are loaded once in the parent process and shared copy-on-write with forked
+uvicorn workers; per-process memory is read back from /proc/<pid>/smaps_rollup (Linux)
+"""
+import gc
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+SMAPS_FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+
+def process_memory(pid="self"):
+    """RSS, PSS, shared and private memory of one process in MiB, or None if unavailable"""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if key in SMAPS_FIELDS:
+                    values[key] = int(rest.split()[0]) / 1024
+    except (OSError, ValueError):
+        return None
+    if len(values) < len(SMAPS_FIELDS):
+        return None
+    return {
+        'rss_mb': round(values['Rss'], 1),
+        # Proportional share: shared pages are split between the processes mapping them,
+        # so PSS sums to the memory the whole pool actually uses
+        'pss_mb': round(values['Pss'], 1),
+        'shared_mb': round(values['Shared_Clean'] + values['Shared_Dirty'], 1),
+        'private_mb': round(values['Private_Clean'] + values['Private_Dirty'], 1)
+    }
+
+
+def child_pids(pid):
+    """Direct children of `pid`; empty when the kernel does not expose them"""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", 'r') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def pool_memory(in_pool):
+    """
+    Memory of every process in the serving pool. `in_pool` is True in a worker forked
+    by WorkerPool, whose parent only has workers as children; the report then covers
+    the parent and all sibling workers. Otherwise it covers only the current process.
+    """
+    pid = os.getpid()
+    if in_pool:
+        parent_pid = os.getppid()
+        processes = [('parent', parent_pid)] + [('worker', child) for child in sorted(child_pids(parent_pid))]
+    else:
+        processes = [('server', pid)]
+
+    report = []
+    for role, process_id in processes:
+        memory = process_memory(process_id)
+        if memory is not None:
+            report.append({'pid': process_id, 'role': role, 'current': process_id == pid, **memory})
+    return {
+        'processes': report,
+        'total_rss_mb': round(sum(p['rss_mb'] for p in report), 1),
+        'total_pss_mb': round(sum(p['pss_mb'] for p in report), 1)
+    }
+
+
+class WorkerPool:
+    """
+    Binds the listening socket, freezes the parent's heap and forks `workers`
+    uvicorn servers that accept on the shared socket. `on_fork(index)` runs in
+    each worker before it serves; a crashed worker is respawned with the same
+    index. A worker that dies within `min_uptime` seconds is respawned with
+    exponential backoff, and after `max_fast_crashes` such crashes in a row
+    the pool shuts down instead of looping. With `cpu_pinning` worker i is
+    pinned to the i-th CPU the parent may run on (round robin; Linux only).
+
+    Objects loaded before `run()` are moved to the GC's permanent generation,
+    so collections in the workers never write to their headers and the pages
+    holding model parameters stay shared instead of being copied per worker.
+    """
+
+    def __init__(self, app, host="0.0.0.0", port=8000, workers=2, cpu_pinning=False,
+                 on_fork=None, log_level="info", min_uptime=5.0, max_fast_crashes=5,
+                 max_backoff=30.0):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.cpu_pinning = cpu_pinning
+        self.on_fork = on_fork
+        self.log_level = log_level
+        self.min_uptime = min_uptime
+        self.max_fast_crashes = max_fast_crashes
+        self.max_backoff = max_backoff
+
+        self._socket = None
+        self._children = {}  # pid -> worker index
+        self._started_at = {}  # worker index -> monotonic spawn time
+        self._fast_crashes = {}  # worker index -> consecutive crashes within min_uptime
+        self._stopping = False
+
+    def run(self):
+        """Serve until stopped; returns False if the pool gave up on a crash-looping worker"""
+        if self.cpu_pinning and not hasattr(os, 'sched_setaffinity'):
+            print("⚠️ CPU pinning is not supported on this platform, workers will not be pinned")
+            self.cpu_pinning = False
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.host, self.port))
+        self._socket.listen(2048)
+        self._socket.set_inheritable(True)
+
+        # Collect first so freed objects do not leave holes in the shared pages
+        gc.collect()
+        gc.freeze()
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        print(f"✓ Serving with {self.workers} workers (parent pid {os.getpid()})")
+
+        gave_up = False
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            index = self._children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+
+            exit_code = os.waitstatus_to_exitcode(status)
+            if time.monotonic() - self._started_at[index] < self.min_uptime:
+                self._fast_crashes[index] = self._fast_crashes.get(index, 0) + 1
+            else:
+                self._fast_crashes[index] = 0
+            crashes = self._fast_crashes[index]
+            if crashes >= self.max_fast_crashes:
+                print(f"❌ Worker {index} (pid {pid}) exited with status {exit_code} "
+                      f"{crashes} times in a row right after starting, shutting down")
+                gave_up = True
+                self._handle_stop(None, None)
+                continue
+
+            delay = min(self.max_backoff, 2 ** max(crashes - 1, 0))
+            print(f"⚠️ Worker {index} (pid {pid}) exited with status {exit_code}, restarting in {delay}s")
+            time.sleep(delay)
+            if not self._stopping:
+                self._spawn(index)
+
+        self._socket.close()
+        return not gave_up
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self, index):
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            self._started_at[index] = time.monotonic()
+            return
+
+        exit_code = 1
+        try:
+            self._run_worker(index)
+            exit_code = 0
+        finally:
+            os._exit(exit_code)
+
+    def _run_worker(self, index):
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        if self.cpu_pinning:
+            cpus = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, {cpus[index % len(cpus)]})
+        if self.on_fork is not None:
+            self.on_fork(index)
+
+        config = uvicorn.Config(self.app, log_level=self.log_level)
+        uvicorn.Server(config).run(sockets=[self._socket])
@@ -0,0 +1,100 @@
+"""
+Benchmark exact SVC against the scalable Nystroem SVM candidate
+Compares accuracy, ROC-AUC, training time and inference latency on synthetic
+diabetes datasets of increasing size
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from generate_datasets import generate_diabetes_dataset
+from model_training import _svm, _svm_nystroem, _output_path
+
+
+def measure(model, X_train, X_test, y_train, y_test):
+    """Fit a model and return quality, training time and inference latency"""
+    from sklearn.metrics import accuracy_score, roc_auc_score
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    train_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred_proba = model.predict_proba(X_test)[:, 1]
+    batch_seconds = time.perf_counter() - start
+    y_pred = model.predict(X_test)
+
+    single_row = X_test[:1]
+    timings = []
+    for _ in range(50):
+        start = time.perf_counter()
+        model.predict_proba(single_row)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'Accuracy': accuracy_score(y_test, y_pred),
+        'ROC-AUC': roc_auc_score(y_test, y_pred_proba),
+        'Train time (s)': train_seconds,
+        'Single-row latency (ms)': float(np.median(timings)) * 1e3,
+        'Batch latency (us/row)': batch_seconds / len(X_test) * 1e6
+    }
+
+
+def run_benchmark(sizes, max_exact_rows):
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    rows = []
+    for n_samples in sizes:
+        print(f"\n{'='*70}")
+        print(f"Dataset size: {n_samples:,} rows")
+        print(f"{'='*70}")
+
+        df = generate_diabetes_dataset(n_samples)
+        X = df.drop(columns=['Outcome'])
+        y = df['Outcome']
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+        X_test = scaler.transform(X_test)
+
+        candidates = {'SVM (Nystroem)': _svm_nystroem}
+        if len(X_train) <= max_exact_rows:
+            candidates['SVM (exact)'] = _svm
+        else:
+            print(f"Skipping exact SVC above {max_exact_rows:,} training rows")
+
+        for name, factory in candidates.items():
+            print(f"\nTraining {name}...")
+            metrics = measure(factory(), X_train, X_test, y_train, y_test)
+            for metric, value in metrics.items():
+                print(f"{metric}: {value:.4f}")
+            rows.append({'Rows': n_samples, 'Model': name, **metrics})
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--max-exact-rows', type=int, default=100_000,
+                        help="Largest training set the exact SVC is run on")
+    args = parser.parse_args()
+
+    results_df = run_benchmark(args.sizes, args.max_exact_rows)
+
+    print(f"\n{'='*70}")
+    print("SVM BENCHMARK")
+    print(f"{'='*70}")
+    print(results_df.round(4).to_string(index=False))
+
+    csv_path = _output_path("results/svm_benchmark.csv")
+    results_df.to_csv(csv_path, index=False)
+    with open(_output_path("results/svm_benchmark.json"), 'w') as f:
+        json.dump(results_df.to_dict(orient='records'), f, indent=2)
+    print(f"\n✓ Benchmark saved to {csv_path}")
@@ -1,35 +1,95 @@
 """
 Machine Learning Model Training Pipeline
 Trains and evaluates multiple ML models for healthcare diagnosis
+
+Usage:
+    python model_training.py                   # all datasets, all models, all stages
+    python model_training.py train --dataset diabetes --models random_forest \
+        --stages train evaluate save --plots off
+    python model_training.py update --dataset diabetes --new-data data/new_cases.csv
 """
+import argparse
+import sys
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
+from multiprocessing import Process
+import io
 import json
 import pickle
 from datetime import datetime
+import time
 
-from sklearn.model_selection import train_test_split, GridSearchCV, cross_val_score
-from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.svm import SVC
-from xgboost import XGBClassifier
-
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    confusion_matrix, classification_report, roc_auc_score, roc_curve
-)
+from backend.compact_forest import CompactForest, CompactLinear, artifact_fingerprint, save_compact
 
 import warnings
 warnings.filterwarnings('ignore')
 
-# Create output directories
-Path("models").mkdir(exist_ok=True)
-Path("results").mkdir(exist_ok=True)
-Path("results/plots").mkdir(exist_ok=True)
+# sklearn, xgboost, matplotlib and seaborn are imported inside the stages that use
+# them, so a headless single-model run does not pay for the plotting stack
+
+def _logistic_regression():
+    from sklearn.linear_model import LogisticRegression
+    return LogisticRegression(random_state=42, max_iter=1000)
+
+def _random_forest():
+    from sklearn.ensemble import RandomForestClassifier
+    return RandomForestClassifier(n_estimators=100, random_state=42)
+
+def _svm():
+    from sklearn.svm import SVC
+    return SVC(probability=True, random_state=42)
+
+def _svm_nystroem(n_components=300):
+    """
+    Scalable RBF-kernel SVM: Nystroem feature map feeding a linear SVM, with
+    Platt scaling fitted once on a 20% held-out slice instead of SVC's internal
+    5-fold cross-validation. Cost is linear in rows and prediction does not depend
+    on a support-vector count.
+    """
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.kernel_approximation import Nystroem
+    from sklearn.model_selection import StratifiedShuffleSplit
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import LinearSVC
+    
+    # gamma=None uses 1 / n_features, which is SVC(gamma='scale') on standardized features
+    return CalibratedClassifierCV(
+        make_pipeline(
+            Nystroem(kernel='rbf', gamma=None, n_components=n_components, random_state=42),
+            LinearSVC(dual=False, random_state=42)
+        ),
+        method='sigmoid',
+        cv=StratifiedShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+    )
+
+def _xgboost():
+    from xgboost import XGBClassifier
+    return XGBClassifier(random_state=42, eval_metric='logloss')
+
+# Candidate models: CLI name -> (display name, factory)
+CANDIDATE_MODELS = {
+    'logistic': ('Logistic Regression', _logistic_regression),
+    'random_forest': ('Random Forest', _random_forest),
+    'svm': ('SVM', _svm),
+    'svm_nystroem': ('SVM (Nystroem)', _svm_nystroem),
+    'xgboost': ('XGBoost', _xgboost)
+}
+
+DATASETS = {
+    'diabetes': ("data/diabetes_data.csv", "Outcome", "🩺 DIABETES PREDICTION MODEL"),
+    'heart_disease': ("data/heart_disease_data.csv", "HeartDisease", "❤️ HEART DISEASE PREDICTION MODEL")
+}
+
+STAGES = ('train', 'evaluate', 'plot', 'save', 'compact')
+
+# Above this many training rows the default candidates use the Nystroem SVM instead of exact SVC
+SVM_EXACT_MAX_ROWS = 20000
+
+def _output_path(path):
+    """Create the parent directory of an output file on first use"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return path
 
 class HealthcareDiagnosisModel:
     """
@@ -45,7 +105,7 @@ class HealthcareDiagnosisModel:
         self.X_test = None
         self.y_train = None
         self.y_test = None
-        self.scaler = StandardScaler()
+        self.scaler = None
         self.models = {}
         self.results = {}
         self.best_model = None
@@ -85,6 +145,9 @@ class HealthcareDiagnosisModel:
         print("Data Preprocessing")
         print(f"{'='*70}")
         
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        
         # Separate features and target
         X = self.df.drop(columns=[self.target_column])
         y = self.df[self.target_column]
@@ -98,23 +161,30 @@ class HealthcareDiagnosisModel:
         print(f"Test set size: {len(self.X_test)}")
         
         # Scale features
+        self.scaler = StandardScaler()
         self.X_train = self.scaler.fit_transform(self.X_train)
         self.X_test = self.scaler.transform(self.X_test)
         
         print("✓ Features scaled using StandardScaler")
         
-    def train_models(self):
-        """Train multiple ML models"""
+    def train_models(self, model_names=None):
+        """
+        Train multiple ML models: the given CANDIDATE_MODELS keys, or by default
+        every candidate with one SVM variant picked by training set size
+        """
         print(f"\n{'='*70}")
         print("Model Training")
         print(f"{'='*70}")
         
+        if model_names is None:
+            skipped = 'svm_nystroem' if len(self.X_train) <= SVM_EXACT_MAX_ROWS else 'svm'
+            model_names = [name for name in CANDIDATE_MODELS if name != skipped]
+        
         # Define models
         self.models = {
-            'Logistic Regression': LogisticRegression(random_state=42, max_iter=1000),
-            'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42),
-            'SVM': SVC(probability=True, random_state=42),
-            'XGBoost': XGBClassifier(random_state=42, eval_metric='logloss')
+            display_name: factory()
+            for name, (display_name, factory) in CANDIDATE_MODELS.items()
+            if name in model_names
         }
         
         # Train each model
@@ -129,6 +199,11 @@ class HealthcareDiagnosisModel:
         print("Model Evaluation")
         print(f"{'='*70}")
         
+        from sklearn.metrics import (
+            accuracy_score, precision_score, recall_score, f1_score,
+            confusion_matrix, roc_auc_score
+        )
+        
         for name, model in self.models.items():
             print(f"\n--- {name} ---")
             
@@ -172,13 +247,13 @@ class HealthcareDiagnosisModel:
         print(f"   Accuracy: {results_df.loc[self.best_model_name, 'Accuracy']:.4f}")
         
         # Save results
-        results_path = f"results/{self.dataset_name}_results.json"
+        results_path = _output_path(f"results/{self.dataset_name}_results.json")
         with open(results_path, 'w') as f:
             json.dump(self.results, f, indent=2)
         print(f"\n✓ Results saved to {results_path}")
         
         # Save results DataFrame as CSV
-        csv_path = f"results/{self.dataset_name}_comparison.csv"
+        csv_path = _output_path(f"results/{self.dataset_name}_comparison.csv")
         results_df.to_csv(csv_path)
         print(f"✓ Comparison saved to {csv_path}")
         
@@ -188,6 +263,11 @@ class HealthcareDiagnosisModel:
         """Create visualization of model performance"""
         print(f"\nGenerating performance visualizations...")
         
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         # Set style
         sns.set_style("whitegrid")
         
@@ -212,7 +292,7 @@ class HealthcareDiagnosisModel:
         axes[1].set_xlim([0, 1])
         
         plt.tight_layout()
-        plot_path = f"results/plots/{self.dataset_name}_comparison.png"
+        plot_path = _output_path(f"results/plots/{self.dataset_name}_comparison.png")
         plt.savefig(plot_path, dpi=300, bbox_inches='tight')
         print(f"✓ Comparison plot saved to {plot_path}")
         plt.close()
@@ -233,6 +313,11 @@ class HealthcareDiagnosisModel:
             }).sort_values('Importance', ascending=False)
             
             # Plot
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+            
             plt.figure(figsize=(10, 6))
             sns.barplot(data=feat_imp_df, x='Importance', y='Feature', palette='viridis')
             plt.title(f'{self.dataset_name} - Feature Importance ({self.best_model_name})', 
@@ -241,7 +326,7 @@ class HealthcareDiagnosisModel:
             plt.ylabel('Features', fontsize=12)
             plt.tight_layout()
             
-            plot_path = f"results/plots/{self.dataset_name}_feature_importance.png"
+            plot_path = _output_path(f"results/plots/{self.dataset_name}_feature_importance.png")
             plt.savefig(plot_path, dpi=300, bbox_inches='tight')
             print(f"✓ Feature importance plot saved to {plot_path}")
             plt.close()
@@ -250,6 +335,11 @@ class HealthcareDiagnosisModel:
         else:
             print(f"Feature importance not available for {self.best_model_name}")
             return None
+    
+    def render_plots(self, results_df):
+        """Render all plots (run inline or in a background process)"""
+        self.plot_model_comparison(results_df)
+        self.plot_feature_importance()
             
     def save_model(self):
         """Save the best model and scaler"""
@@ -258,7 +348,7 @@ class HealthcareDiagnosisModel:
         print(f"{'='*70}")
         
         # Save model
-        model_path = f"models/{self.dataset_name}_model.pkl"
+        model_path = _output_path(f"models/{self.dataset_name}_model.pkl")
         with open(model_path, 'wb') as f:
             pickle.dump(self.best_model, f)
         print(f"✓ Model saved to {model_path}")
@@ -270,13 +360,14 @@ class HealthcareDiagnosisModel:
         print(f"✓ Scaler saved to {scaler_path}")
         
         # Save metadata
+        self.training_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         metadata = {
             'model_name': self.best_model_name,
             'dataset': self.dataset_name,
             'features': list(self.df.drop(columns=[self.target_column]).columns),
             'target': self.target_column,
             'metrics': self.results[self.best_model_name],
-            'training_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'training_date': self.training_date,
             'train_size': len(self.X_train),
             'test_size': len(self.X_test)
         }
@@ -286,53 +377,541 @@ class HealthcareDiagnosisModel:
             json.dump(metadata, f, indent=2)
         print(f"✓ Metadata saved to {metadata_path}")
         
-    def run_pipeline(self):
-        """Execute full ML pipeline"""
+        # Save training reference profile for online drift monitoring
+        reference_path = f"models/{self.dataset_name}_reference.json"
+        with open(reference_path, 'w') as f:
+            json.dump(self.build_reference_profile(), f, indent=2)
+        print(f"✓ Drift reference profile saved to {reference_path}")
+        
+        # A compact artifact was built from the previous model and scaler; the compact
+        # stage, when it runs, writes a new one after this
+        compact_path = Path(f"models/{self.dataset_name}_compact.npz")
+        if compact_path.exists():
+            compact_path.unlink()
+            print(f"✓ Removed stale {compact_path}")
+
+    def build_reference_profile(self, n_bins=10, max_categories=10):
+        """
+        Per-feature distribution of the (unscaled) training split: quantile-bin
+        histograms for continuous features, category proportions for discrete ones
+        """
+        feature_names = list(self.df.drop(columns=[self.target_column]).columns)
+        X_raw = self.scaler.inverse_transform(self.X_train)
+        
+        profile = {'n_samples': len(X_raw), 'features': {}}
+        for i, name in enumerate(feature_names):
+            values = X_raw[:, i]
+            rounded = np.round(values)
+            categories = np.unique(rounded)
+            entry = {
+                'mean': float(self.scaler.mean_[i]),
+                'std': float(self.scaler.scale_[i])
+            }
+            if np.allclose(values, rounded) and len(categories) <= max_categories:
+                counts = np.array([(rounded == c).sum() for c in categories])
+                entry['type'] = 'categorical'
+                entry['categories'] = [int(c) for c in categories]
+                entry['proportions'] = (counts / counts.sum()).tolist()
+            else:
+                # Interior quantile edges; bin k holds edges[k-1] < x <= edges[k]
+                edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+                counts = np.bincount(np.searchsorted(edges, values, side='left'), minlength=len(edges) + 1)
+                entry['type'] = 'continuous'
+                entry['bin_edges'] = edges.tolist()
+                entry['proportions'] = (counts / counts.sum()).tolist()
+            profile['features'][name] = entry
+        
+        return profile
+
+    @staticmethod
+    def _rank_trees_by_oob(forest, X, y):
+        """Order forest trees by accuracy on their own out-of-bag training rows"""
+        from sklearn.ensemble._forest import _generate_unsampled_indices, _get_n_samples_bootstrap
+        
+        if not forest.bootstrap:
+            return list(forest.estimators_)
+
+        y = np.asarray(y)
+        n_samples_bootstrap = _get_n_samples_bootstrap(len(y), forest.max_samples)
+        scores = []
+        for estimator in forest.estimators_:
+            oob = _generate_unsampled_indices(estimator.random_state, len(y), n_samples_bootstrap)
+            scores.append(np.mean(estimator.predict(X[oob]) == y[oob]) if len(oob) else 0.0)
+        order = np.argsort(-np.asarray(scores), kind='stable')
+        return [forest.estimators_[i] for i in order]
+
+    def _build_variants(self, teacher, X, y, n_augment):
+        """Compacted variants of a fitted teacher, built from its training rows X, y only"""
+        from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+        from sklearn.linear_model import LogisticRegression
+
+        variants = {}
+        if isinstance(teacher, RandomForestClassifier):
+            trees = self._rank_trees_by_oob(teacher, X, y)
+            variants['float32 (all trees)'] = CompactForest.from_estimators(trees)
+            for k in (10, 25, 50):
+                if k < len(trees):
+                    variants[f'top {k} trees'] = CompactForest.from_estimators(trees[:k])
+            for depth in (6, 10):
+                variants[f'depth <= {depth}'] = CompactForest.from_estimators(trees, max_depth=depth)
+            variants['top 25 trees, depth <= 8'] = CompactForest.from_estimators(trees[:25], max_depth=8)
+
+        # Distillation: fit small students on the teacher's probabilities over the
+        # training rows plus jittered copies (scaled space) to densify the transfer set
+        rng = np.random.default_rng(42)
+        X_transfer = np.vstack([X] + [X + rng.normal(0, 0.25, X.shape) for _ in range(n_augment)])
+        soft_labels = teacher.predict_proba(X_transfer)[:, 1]
+
+        student_trees = RandomForestRegressor(n_estimators=10, max_depth=6, random_state=42)
+        student_trees.fit(X_transfer, soft_labels)
+        variants['distilled 10 trees, depth <= 6'] = CompactForest.from_estimators(student_trees.estimators_)
+
+        # Logistic student on soft targets: each row appears as both classes, weighted by p and 1 - p
+        student_linear = LogisticRegression(random_state=42, max_iter=1000)
+        student_linear.fit(
+            np.vstack([X_transfer, X_transfer]),
+            np.r_[np.ones(len(X_transfer)), np.zeros(len(X_transfer))],
+            sample_weight=np.r_[soft_labels, 1 - soft_labels]
+        )
+        variants['distilled logistic'] = CompactLinear.from_estimator(student_linear)
+        return variants
+
+    def _measure_variant(self, model, size_bytes, repeats=200):
+        """Test-set metrics, single-row and batch latency for a (compacted) model"""
+        from sklearn.metrics import accuracy_score, roc_auc_score
+        
+        y_pred = model.predict(self.X_test)
+        y_pred_proba = model.predict_proba(self.X_test)[:, 1]
+
+        single_row = self.X_test[:1]
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.predict_proba(single_row)
+            timings.append(time.perf_counter() - start)
+        batch_timings = []
+        for _ in range(max(repeats // 10, 5)):
+            start = time.perf_counter()
+            model.predict_proba(self.X_test)
+            batch_timings.append(time.perf_counter() - start)
+
+        return {
+            'Accuracy': accuracy_score(self.y_test, y_pred),
+            'ROC-AUC': roc_auc_score(self.y_test, y_pred_proba),
+            'Size (KB)': size_bytes / 1024,
+            'Single-row latency (ms)': float(np.median(timings)) * 1e3,
+            'Batch latency (us/row)': float(np.median(batch_timings)) / len(self.X_test) * 1e6
+        }
+
+    def compact_model(self, max_accuracy_drop=0.01, max_auc_drop=0.01, n_augment=4, n_folds=5,
+                      size_tolerance=0.1):
+        """
+        Build compacted variants of the best model (tree subsets, depth limits,
+        float32 node arrays, distilled students), report their accuracy/ROC-AUC
+        change against size and latency, and save the smallest variant that is
+        smaller or faster than the original and within the allowed quality drop
+        as models/<dataset>_compact.npz. Quality is judged on out-of-fold
+        predictions over all training rows (k-fold); variants within
+        `size_tolerance` of the smallest eligible size are ranked by that quality.
+        """
+        print(f"\n{'='*70}")
+        print("Model Compaction")
+        print(f"{'='*70}")
+
+        from sklearn.base import clone
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.metrics import accuracy_score, roc_auc_score
+        from sklearn.model_selection import StratifiedKFold
+
+        teacher = self.best_model
+        if not isinstance(teacher, RandomForestClassifier):
+            print(f"Tree pruning not available for {self.best_model_name}, distillation only")
+
+        # Choose the variant on out-of-fold predictions over the training rows, so the test
+        # set only reports on the choice: per fold, refit the teacher without the held-out
+        # rows, compact it the same way and predict the held-out rows
+        y_train = np.asarray(self.y_train)
+        folds = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42)
+        oof_pred, oof_proba = {}, {}
+        for fit_rows, val_rows in folds.split(self.X_train, y_train):
+            fold_teacher = clone(teacher).fit(self.X_train[fit_rows], y_train[fit_rows])
+            fold_models = {'original': fold_teacher}
+            fold_models.update(self._build_variants(fold_teacher, self.X_train[fit_rows], y_train[fit_rows], n_augment))
+            for name, model in fold_models.items():
+                oof_pred.setdefault(name, np.empty_like(y_train))[val_rows] = model.predict(self.X_train[val_rows])
+                oof_proba.setdefault(name, np.empty(len(y_train)))[val_rows] = model.predict_proba(self.X_train[val_rows])[:, 1]
+        validation = {
+            name: {'Accuracy': accuracy_score(y_train, oof_pred[name]),
+                   'ROC-AUC': roc_auc_score(y_train, oof_proba[name])}
+            for name in oof_pred
+        }
+
+        variants = self._build_variants(teacher, self.X_train, y_train, n_augment)
+
+        # Measure the original artifact and every variant the same way
+        report = {'original': self._measure_variant(teacher, len(pickle.dumps(teacher)))}
+        for name, variant in variants.items():
+            buffer = io.BytesIO()
+            save_compact(variant, buffer)
+            metrics = self._measure_variant(variant, buffer.getbuffer().nbytes)
+            metrics['Accuracy change'] = metrics['Accuracy'] - report['original']['Accuracy']
+            metrics['ROC-AUC change'] = metrics['ROC-AUC'] - report['original']['ROC-AUC']
+            metrics['Validation accuracy change'] = validation[name]['Accuracy'] - validation['original']['Accuracy']
+            metrics['Validation ROC-AUC change'] = validation[name]['ROC-AUC'] - validation['original']['ROC-AUC']
+            metrics['Size ratio'] = metrics['Size (KB)'] / report['original']['Size (KB)']
+            metrics['Speedup (single row)'] = (report['original']['Single-row latency (ms)'] /
+                                               metrics['Single-row latency (ms)'])
+            report[name] = metrics
+
+        report_df = pd.DataFrame(report).T
+        print(report_df.round(4).to_string())
+
+        # Keep the variants that stay within the allowed validation quality drop and are
+        # actually smaller or faster than the original; among those about as small as the
+        # smallest, pick the one with the best validation quality
+        eligible = [
+            name for name in variants
+            if report[name]['Validation accuracy change'] >= -max_accuracy_drop
+            and report[name]['Validation ROC-AUC change'] >= -max_auc_drop
+            and (report[name]['Size ratio'] < 1 or report[name]['Speedup (single row)'] > 1)
+        ]
+        if not eligible:
+            print("\n⚠️ No compacted variant is smaller or faster within the allowed accuracy/ROC-AUC drop, nothing saved")
+            selected = None
+            # An artifact from an earlier run no longer matches the scaler just saved
+            stale_path = Path(f"models/{self.dataset_name}_compact.npz")
+            if stale_path.exists():
+                stale_path.unlink()
+                print(f"✓ Removed stale {stale_path}")
+        else:
+            smallest = min(report[name]['Size (KB)'] for name in eligible)
+            selected = max(
+                (name for name in eligible if report[name]['Size (KB)'] <= smallest * (1 + size_tolerance)),
+                key=lambda name: (report[name]['Validation ROC-AUC change'],
+                                  report[name]['Validation accuracy change'],
+                                  -report[name]['Size (KB)'])
+            )
+            compact = variants[selected]
+            compact.info = {
+                'variant': selected,
+                'source_model': self.best_model_name,
+                # Lets the backend refuse this file once the saved model or scaler changes
+                'fingerprint': artifact_fingerprint(self.scaler, getattr(self, 'training_date', None)),
+                'metrics': {k: report[selected][k] for k in ('Accuracy', 'ROC-AUC')}
+            }
+            compact_path = _output_path(f"models/{self.dataset_name}_compact.npz")
+            save_compact(compact, compact_path)
+            print(f"\n🗜️ Selected compact variant: {selected}")
+            print(f"✓ Compact model saved to {compact_path}")
+
+        report_path = _output_path(f"results/{self.dataset_name}_compaction.json")
+        with open(report_path, 'w') as f:
+            json.dump({'selected': selected, 'variants': report}, f, indent=2)
+        print(f"✓ Compaction report saved to {report_path}")
+
+        return report_df
+
+    @staticmethod
+    def _remap_thresholds(thresholds, features, old_mean, old_scale, new_mean, new_scale, strict=False):
+        """
+        Map split thresholds from the old scaled feature space to the new one.
+        Raw values lying exactly on a split (common with integer-valued features)
+        keep the side they went to before, which float32 rounding would otherwise
+        decide arbitrarily. strict=True is for `x < t` splits (XGBoost), else `x <= t`.
+        """
+        m0, s0 = old_mean[features], old_scale[features]
+        m1, s1 = new_mean[features], new_scale[features]
+        raw = thresholds * s0 + m0
+        remapped = (raw - m1) / s1
+
+        # Model inputs are scaled in float64 and compared as float32
+        tie = np.array([float(f"{value:.6g}") for value in raw])
+        tie_old = ((tie - m0) / s0).astype(np.float32)
+        tie_new = ((tie - m1) / s1).astype(np.float32)
+        if strict:
+            remapped = remapped.astype(np.float32)
+            went_left, goes_left = tie_old < thresholds, tie_new < remapped
+            remapped[went_left & ~goes_left] = np.nextafter(tie_new, np.float32(np.inf))[went_left & ~goes_left]
+            remapped[~went_left & goes_left] = tie_new[~went_left & goes_left]
+        else:
+            went_left, goes_left = tie_old <= thresholds, tie_new <= remapped
+            tie_new = tie_new.astype(np.float64)
+            remapped[went_left & ~goes_left] = tie_new[went_left & ~goes_left]
+            remapped[~went_left & goes_left] = np.nextafter(tie_new, -np.inf)[~went_left & goes_left]
+        return remapped
+
+    @classmethod
+    def _rescale_model(cls, model, old_mean, old_scale, new_mean, new_scale):
+        """
+        Re-express a fitted model in the space of an updated StandardScaler so it
+        keeps making the same predictions on the same raw inputs
+        """
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.linear_model import LogisticRegression, SGDClassifier
+        
+        scaling = (old_mean, old_scale, new_mean, new_scale)
+
+        if isinstance(model, RandomForestClassifier):
+            for estimator in model.estimators_:
+                tree = estimator.tree_
+                internal = tree.feature >= 0
+                tree.threshold[internal] = cls._remap_thresholds(
+                    tree.threshold[internal], tree.feature[internal], *scaling
+                )
+        elif hasattr(model, 'get_booster'):
+            # XGBoost
+            booster = model.get_booster()
+            raw = json.loads(booster.save_raw('json'))
+            for tree in raw['learner']['gradient_booster']['model']['trees']:
+                # Leaves keep their value in split_conditions
+                conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+                internal = np.asarray(tree['left_children']) != -1
+                conditions[internal] = cls._remap_thresholds(
+                    conditions[internal], np.asarray(tree['split_indices'])[internal], *scaling, strict=True
+                )
+                tree['split_conditions'] = conditions.tolist()
+            booster.load_model(bytearray(json.dumps(raw).encode('utf-8')))
+        elif isinstance(model, (LogisticRegression, SGDClassifier)):
+            # x_old = a * x_new + b, so w . x_old + c = (w * a) . x_new + (c + w . b)
+            a = new_scale / old_scale
+            b = (new_mean - old_mean) / old_scale
+            model.intercept_ = model.intercept_ + model.coef_ @ b
+            model.coef_ = model.coef_ * a
+        else:
+            raise ValueError(f"{type(model).__name__} cannot be updated incrementally, run the full pipeline")
+
+    def incremental_update(self, new_data_path, n_new_trees=20, n_boost_rounds=20, sgd_epochs=5,
+                           max_accuracy_drop=0.01, max_auc_drop=0.01):
+        """
+        Warm-start update of the saved model on newly labelled rows only:
+        update the scaler statistics, extend the model (extra Random Forest trees,
+        extra XGBoost rounds, SGD epochs for linear models), validate on the
+        original held-out split and save only if quality holds up.
+        Returns True if the updated artifacts were saved.
+        """
+        print(f"\n{'='*70}")
+        print(f"Incremental Update: {self.dataset_name}")
+        print(f"{'='*70}")
+
+        from sklearn.model_selection import train_test_split
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.linear_model import LogisticRegression, SGDClassifier
+        from sklearn.metrics import precision_score, recall_score, f1_score
+
+        # Load current artifacts
+        with open(f"models/{self.dataset_name}_model.pkl", 'rb') as f:
+            model = pickle.load(f)
+        with open(f"models/{self.dataset_name}_scaler.pkl", 'rb') as f:
+            self.scaler = pickle.load(f)
+        metadata_path = f"models/{self.dataset_name}_metadata.json"
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+        features = metadata['features']
+
+        # Held-out set: the same split the saved model was evaluated on
+        df = pd.read_csv(self.dataset_path)
+        _, X_test_raw, _, self.y_test = train_test_split(
+            df[features], df[self.target_column], test_size=0.2, random_state=42, stratify=df[self.target_column]
+        )
+        new_df = pd.read_csv(new_data_path)
+        X_new_raw, y_new = new_df[features], new_df[self.target_column]
+        print(f"New labelled rows: {len(new_df)}")
+        # Warm-started fits re-infer the classes from the new rows alone
+        classes = model.classes_.tolist()
+        missing_classes = sorted(set(classes) - set(y_new.tolist()))
+        if missing_classes:
+            raise ValueError(
+                f"New data has no rows of class {missing_classes}; an incremental update needs "
+                f"labelled rows of every class the model predicts ({classes})"
+            )
+
+        self.X_test = self.scaler.transform(X_test_raw)
+        before = self._measure_variant(model, len(pickle.dumps(model)), repeats=10)
+
+        # Update scaler statistics, then move the existing model into the new feature space
+        start = time.perf_counter()
+        old_mean, old_scale = self.scaler.mean_.copy(), self.scaler.scale_.copy()
+        self.scaler.partial_fit(X_new_raw)
+        self._rescale_model(model, old_mean, old_scale, self.scaler.mean_, self.scaler.scale_)
+        X_new = self.scaler.transform(X_new_raw)
+        self.X_test = self.scaler.transform(X_test_raw)
+
+        # Extend the model using only the new rows
+        if isinstance(model, RandomForestClassifier):
+            model.set_params(warm_start=True, n_estimators=model.n_estimators + n_new_trees)
+            model.fit(X_new, y_new)
+            model.set_params(warm_start=False)
+            detail = f"+{n_new_trees} trees"
+        elif hasattr(model, 'get_booster'):
+            booster = model.get_booster()
+            model = type(model)(**{**model.get_params(), 'n_estimators': n_boost_rounds})
+            model.fit(X_new, y_new, xgb_model=booster)
+            detail = f"+{n_boost_rounds} boosting rounds"
+        else:
+            detail = f"{sgd_epochs} SGD epochs"
+            if isinstance(model, LogisticRegression):
+                # LogisticRegression has no partial_fit: continue from its weights with SGD on log-loss
+                model = SGDClassifier(
+                    loss='log_loss', alpha=1.0 / (model.C * metadata['train_size']),
+                    learning_rate='constant', eta0=0.01, max_iter=sgd_epochs, tol=None, random_state=42
+                ).fit(X_new, y_new, coef_init=model.coef_, intercept_init=model.intercept_)
+                detail += ", converted LogisticRegression to SGDClassifier"
+            else:
+                for _ in range(sgd_epochs):
+                    model.partial_fit(X_new, y_new)
+        update_seconds = time.perf_counter() - start
+        print(f"✓ Model updated ({detail}) in {update_seconds:.2f}s")
+
+        # Validate against the held-out set before saving
+        after = self._measure_variant(model, len(pickle.dumps(model)), repeats=10)
+        for metric in ('Accuracy', 'ROC-AUC'):
+            print(f"{metric}: {before[metric]:.4f} -> {after[metric]:.4f}")
+        if (after['Accuracy'] < before['Accuracy'] - max_accuracy_drop
+                or after['ROC-AUC'] < before['ROC-AUC'] - max_auc_drop):
+            print("\n⚠️ Updated model is worse on the held-out set, keeping the current artifacts")
+            return False
+
+        with open(f"models/{self.dataset_name}_model.pkl", 'wb') as f:
+            pickle.dump(model, f)
+        with open(f"models/{self.dataset_name}_scaler.pkl", 'wb') as f:
+            pickle.dump(self.scaler, f)
+
+        y_pred = model.predict(self.X_test)
+        metadata['metrics'] = {
+            'Accuracy': after['Accuracy'],
+            'Precision': precision_score(self.y_test, y_pred, zero_division=0),
+            'Recall': recall_score(self.y_test, y_pred, zero_division=0),
+            'F1-Score': f1_score(self.y_test, y_pred, zero_division=0),
+            'ROC-AUC': after['ROC-AUC']
+        }
+        metadata['training_date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        metadata['train_size'] += len(new_df)
+        if isinstance(model, SGDClassifier) and not metadata['model_name'].endswith("(SGD)"):
+            # The saved artifact is no longer a LogisticRegression
+            metadata['model_name'] += " (SGD)"
+        metadata.setdefault('incremental_updates', []).append({
+            'date': metadata['training_date'],
+            'rows': len(new_df),
+            'source': str(new_data_path),
+            'update': detail
+        })
+        with open(metadata_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+        # The compact artifact was built in the old feature space and is now stale
+        compact_path = Path(f"models/{self.dataset_name}_compact.npz")
+        if compact_path.exists():
+            compact_path.unlink()
+            print(f"✓ Removed stale {compact_path}, re-run the full pipeline to rebuild it")
+
+        print("✓ Updated model, scaler and metadata saved")
+        return True
+
+    def run_pipeline(self, model_names=None, stages=STAGES, plots='inline'):
+        """
+        Execute the ML pipeline. `stages` selects from STAGES (plot/save/compact
+        imply evaluate, compact implies save); `plots` is 'inline', 'background' or 'off'.
+        Returns the background plotting process, if one was started.
+        """
         self.load_data()
         self.preprocess_data()
-        self.train_models()
-        results_df = self.evaluate_models()
-        self.plot_model_comparison(results_df)
-        self.plot_feature_importance()
-        self.save_model()
+        self.train_models(model_names)
+        
+        plot_process = None
+        if any(stage in stages for stage in ('evaluate', 'plot', 'save', 'compact')):
+            results_df = self.evaluate_models()
+            if 'plot' in stages and plots == 'background':
+                plot_process = Process(target=self.render_plots, args=(results_df,))
+                plot_process.start()
+                print("\nRendering plots in background process...")
+            elif 'plot' in stages and plots == 'inline':
+                self.render_plots(results_df)
+            # The compact artifact is served with the saved scaler, so both must come from this run
+            if 'save' in stages or 'compact' in stages:
+                self.save_model()
+            if 'compact' in stages:
+                self.compact_model()
         
         print(f"\n{'='*70}")
         print(f"✅ {self.dataset_name} Pipeline Complete!")
         print(f"{'='*70}")
+        return plot_process
+
+def parse_args(argv=None):
+    """Command line interface: `train` (default) and `update` subcommands"""
+    parser = argparse.ArgumentParser(description="Healthcare diagnosis ML training pipeline")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    train = subparsers.add_parser('train', help="Train, evaluate and save models")
+    train.add_argument('--dataset', choices=[*DATASETS, 'all'], default='all')
+    train.add_argument('--models', nargs='+', choices=list(CANDIDATE_MODELS), default=None,
+                       help="Candidate models to train (default: all)")
+    train.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES),
+                       help="Stages to run; training always runs and compact implies save (default: all)")
+    train.add_argument('--plots', choices=['inline', 'background', 'off'], default='inline',
+                       help="Render plots inline, in a background process, or not at all")
+    
+    update = subparsers.add_parser('update', help="Warm-start update of saved models on new labelled data")
+    update.add_argument('--dataset', choices=list(DATASETS), required=True)
+    update.add_argument('--new-data', required=True, help="CSV of newly labelled rows")
+    update.add_argument('--n-new-trees', type=int, default=20)
+    update.add_argument('--boost-rounds', type=int, default=20)
+    update.add_argument('--sgd-epochs', type=int, default=5)
+    
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(['train'])
+    return args
 
 if __name__ == "__main__":
+    args = parse_args()
+    
     print("\n" + "="*70)
     print("HEALTHCARE DIAGNOSIS - ML TRAINING PIPELINE")
     print("="*70)
     
-    # Train Diabetes Model
-    print("\n\n🩺 DIABETES PREDICTION MODEL")
-    diabetes_pipeline = HealthcareDiagnosisModel(
-        dataset_path="data/diabetes_data.csv",
-        target_column="Outcome",
-        dataset_name="diabetes"
-    )
-    diabetes_pipeline.run_pipeline()
-    
-    # Train Heart Disease Model
-    print("\n\n❤️ HEART DISEASE PREDICTION MODEL")
-    heart_pipeline = HealthcareDiagnosisModel(
-        dataset_path="data/heart_disease_data.csv",
-        target_column="HeartDisease",
-        dataset_name="heart_disease"
-    )
-    heart_pipeline.run_pipeline()
-    
-    print("\n\n" + "="*70)
-    print("🎉 ALL MODELS TRAINED SUCCESSFULLY!")
-    print("="*70)
-    print("\nGenerated Files:")
-    print("  📁 models/")
-    print("     - diabetes_model.pkl")
-    print("     - heart_disease_model.pkl")
-    print("     - *_scaler.pkl")
-    print("     - *_metadata.json")
-    print("  📁 results/")
-    print("     - *_results.json")
-    print("     - *_comparison.csv")
-    print("     - plots/*.png")
+    if args.command == 'update':
+        dataset_path, target_column, _ = DATASETS[args.dataset]
+        pipeline = HealthcareDiagnosisModel(dataset_path, target_column, args.dataset)
+        try:
+            pipeline.incremental_update(
+                args.new_data, n_new_trees=args.n_new_trees,
+                n_boost_rounds=args.boost_rounds, sgd_epochs=args.sgd_epochs
+            )
+        except ValueError as e:
+            print(f"\n❌ Update failed: {e}")
+            sys.exit(1)
+    else:
+        datasets = list(DATASETS) if args.dataset == 'all' else [args.dataset]
+        plot_processes = []
+        for dataset_name in datasets:
+            dataset_path, target_column, title = DATASETS[dataset_name]
+            print(f"\n\n{title}")
+            pipeline = HealthcareDiagnosisModel(
+                dataset_path=dataset_path,
+                target_column=target_column,
+                dataset_name=dataset_name
+            )
+            plot_process = pipeline.run_pipeline(args.models, args.stages, args.plots)
+            if plot_process is not None:
+                plot_processes.append(plot_process)
+        
+        for plot_process in plot_processes:
+            plot_process.join()
+        
+        print("\n\n" + "="*70)
+        print("🎉 ALL MODELS TRAINED SUCCESSFULLY!")
+        print("="*70)
+        print("\nGenerated Files:")
+        print("  📁 models/")
+        print("     - diabetes_model.pkl")
+        print("     - heart_disease_model.pkl")
+        print("     - *_scaler.pkl")
+        print("     - *_metadata.json")
+        print("     - *_compact.npz")
+        print("     - *_reference.json")
+        print("  📁 results/")
+        print("     - *_results.json")
+        print("     - *_comparison.csv")
+        print("     - *_compaction.json")
+        print("     - plots/*.png")